@@ -4,106 +4,189 @@ All settings and parameters for the email validation system
 """
 
 import os
+from types import MappingProxyType
+from typing import Final
 
 # Directory Configuration
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_DIR = os.path.join(BASE_DIR, 'data')
-INPUT_FOLDER = os.path.join(DATA_DIR, 'input')
-OUTPUT_FOLDER = os.path.join(DATA_DIR, 'output')
-LOGS_FOLDER = os.path.join(BASE_DIR, 'logs')
+BASE_DIR: Final = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR: Final = os.path.join(BASE_DIR, 'data')
+INPUT_FOLDER: Final = os.path.join(DATA_DIR, 'input')
+OUTPUT_FOLDER: Final = os.path.join(DATA_DIR, 'output')
+LOGS_FOLDER: Final = os.path.join(BASE_DIR, 'logs')
 
 # File Configuration
-PROXY_FILE = 'proxies.txt'
-PROGRESS_FILE = os.path.join(DATA_DIR, 'progress.json')
-LOG_FILE = os.path.join(LOGS_FOLDER, 'email_validator.log')
+PROXY_FILE: Final = 'proxies.txt'
+PROGRESS_FILE: Final = os.path.join(DATA_DIR, 'progress.json')
+DISPOSABLE_DOMAINS_FILE: Final = os.path.join(DATA_DIR, 'disposable_domains.txt')  # Optional blocklist, one domain per line
+LOG_FILE: Final = os.path.join(LOGS_FOLDER, 'email_validator.log')
 
 # Processing Configuration
-BATCH_SIZE = 10  # Number of emails to process in each batch
-MAX_WORKERS = 5  # Maximum number of threads for concurrent processing
-DELAY_BETWEEN_BATCHES = 0.5  # Delay in seconds between batches
+BATCH_SIZE: Final = 10  # Number of emails to process in each batch
+MAX_WORKERS: Final = 5  # Maximum number of threads for concurrent processing
+VALIDATION_CONCURRENCY: Final = MAX_WORKERS * 10  # Emails validated concurrently on the event loop by validate_batch
+DELAY_BETWEEN_BATCHES: Final = 0.5  # Delay in seconds between batches
 
 # Network Configuration
-TIMEOUT = 10  # General timeout for network operations
-SMTP_TIMEOUT = 15  # SMTP-specific timeout
-SMTP_PORT = 587  # Default SMTP port
-DNS_TIMEOUT = 5  # DNS query timeout
+TIMEOUT: Final = 10  # General timeout for network operations
+SMTP_TIMEOUT: Final = 15  # SMTP-specific timeout
+SMTP_PORT: Final = 587  # Default SMTP port
+SMTP_BATCH_CONCURRENCY: Final = 200  # SMTP conversations in flight at once in verify_emails_deliverability
+SMTP_POOL_MAX_HOSTS: Final = 100  # MX hosts whose idle SMTP sessions are kept for reuse
+SMTP_POOL_IDLE_TIMEOUT: Final = 30  # Seconds an idle SMTP session is trusted before reconnecting
+SMTP_POOL_MAX_AGE: Final = 100  # Seconds after which a pooled SMTP session is retired instead of reused
+SMTP_POOL_MAX_RECIPIENTS: Final = 100  # Recipients checked on one SMTP session before it is retired
+SMTP_PROBE_CACHE_SIZE: Final = 1000  # MX hosts / domains whose SMTP reachability results are cached
+SMTP_PROBE_CACHE_TTL: Final = 300  # Cache lifetime in seconds for SMTP reachability and discovery results
+DNS_TIMEOUT: Final = 5  # DNS query timeout
+DNS_NAMESERVERS: Final = ('1.1.1.1', '8.8.8.8', '9.9.9.9', '8.8.4.4')  # Upstream resolvers (empty = system default)
+DNS_ROTATE_NAMESERVERS: Final = True  # Start each query at a different nameserver to spread load
+
+# DNS Cache Configuration
+DNS_CACHE_SIZE: Final = 10000  # Maximum cached answers per record type
+DNS_CACHE_MAX_TTL: Final = 3600  # Upper bound in seconds on how long a DNS answer is cached
+DNS_NEGATIVE_CACHE_TTL: Final = 60  # Cache lifetime in seconds for NXDOMAIN/no-answer results
+DNS_BATCH_CONCURRENCY: Final = 100  # Domains resolved concurrently by validate_domains_batch
+DNS_MAX_CONCURRENCY: Final = 100  # Maximum resolver queries in flight at once (excess calls wait)
+DNS_RBL_CACHE_TTL: Final = 300  # Cache lifetime in seconds for DNS blacklist results per IP
+DNS_CACHE_FILE: Final = os.path.join(DATA_DIR, 'dns_cache.sqlite3')  # Persisted between runs when auto-resume is on
 
 # Proxy Configuration
-PROXY_ROTATION_COUNT = 50  # Number of requests before rotating proxy
-PROXY_TIMEOUT = 10  # Proxy connection timeout
-MAX_PROXY_RETRIES = 3  # Maximum retry attempts per proxy
+PROXY_ROTATION_COUNT: Final = 50  # Number of requests before rotating proxy
+PROXY_TIMEOUT: Final = 10  # Proxy connection timeout
+MAX_PROXY_RETRIES: Final = 3  # Maximum retry attempts per proxy
+PROXY_TEST_CONCURRENCY: Final = 64  # Proxies checked in parallel by test_all_proxies
+PROXY_TEST_RETRIES: Final = 1  # Retries for a proxy check on connection errors and 429/5xx responses
+PROXY_TEST_RETRY_BACKOFF: Final = 0.25  # Exponential backoff factor in seconds between proxy check retries
+PROXY_HEALTH_CHECK_INTERVAL: Final = 300  # Seconds between background re-tests of all proxies (0 = off)
+PROXY_SELECTION_STRATEGY: Final = 'round_robin'  # round_robin, random, best (highest success rate), weighted
+PROXY_RETRY_BACKOFF: Final = 30  # Seconds before a failed proxy is retried; doubles per failure
+PROXY_RETRY_BACKOFF_MAX: Final = 600  # Upper bound in seconds on a failed proxy's backoff
 
 # Email Configuration
-TEST_EMAIL_RECIPIENT = ""  # Will be set during runtime
-TEST_EMAIL_SUBJECT = "Email Validation Test"
-TEST_EMAIL_BODY = "This is a test email from the Email Validator tool."
+TEST_EMAIL_RECIPIENT = ""  # Will be set during runtime (deliberately not Final)
+TEST_EMAIL_SUBJECT: Final = "Email Validation Test"
+TEST_EMAIL_BODY: Final = "This is a test email from the Email Validator tool."
 
 # Validation Configuration
-ENABLE_COUNTRY_DETECTION = True
-ENABLE_SPAM_TRAP_DETECTION = True
-ENABLE_MISSPELLING_DETECTION = True
-ENABLE_DISPOSABLE_DETECTION = True
+ENABLE_COUNTRY_DETECTION: Final = True
+ENABLE_SPAM_TRAP_DETECTION: Final = True
+ENABLE_MISSPELLING_DETECTION: Final = True
+ENABLE_DISPOSABLE_DETECTION: Final = True
+ASSUME_TRUSTED_PROVIDERS_VALID: Final = False  # Skip SMTP connection/RCPT checks for TRUSTED_MAIL_PROVIDERS (mailbox is assumed, not verified)
+
+# Major providers whose SMTP servers accept every RCPT or throttle probes, so checks add latency but no signal
+TRUSTED_MAIL_PROVIDERS: Final = frozenset({
+    'gmail.com', 'googlemail.com',
+    'outlook.com', 'hotmail.com', 'live.com', 'msn.com',
+    'yahoo.com', 'ymail.com', 'aol.com',
+    'icloud.com', 'me.com', 'mac.com'
+})
+
+# Domain Reputation Configuration
+SUSPICIOUS_DOMAIN_PATTERNS: Final = (
+    'temp', 'temporary', 'disposable', 'fake', 'test',
+    'spam', 'trash', 'junk', 'throwaway'
+)  # Substrings that flag a domain as suspicious
 
 # Scoring Configuration
-VALIDATION_SCORE_WEIGHTS = {
+VALIDATION_SCORE_WEIGHTS: Final = MappingProxyType({
     'syntax': 20,
     'dns': 15,
     'smtp_connection': 20,
     'mailbox_exists': 15,
     'authentication': 25,
     'test_email': 5
-}
+})
 
 # Logging Configuration
-LOG_LEVEL = 'INFO'  # DEBUG, INFO, WARNING, ERROR, CRITICAL
-LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
-LOG_DATE_FORMAT = '%H:%M:%S'
-ENABLE_FILE_LOGGING = True
-ENABLE_CONSOLE_LOGGING = True
+LOG_LEVEL: Final = 'INFO'  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+LOG_FORMAT: Final = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT: Final = '%H:%M:%S'
+ENABLE_FILE_LOGGING: Final = True
+ENABLE_CONSOLE_LOGGING: Final = True
 
 # API Configuration (for geolocation)
-GEOLOCATION_APIS = [
-    'http://ip-api.com/json/',
-    'https://ipapi.co/json/',
-    'https://api.ipify.org?format=json'
-]
+# Result field -> ip-api.com response field (shared by the single and batch endpoints)
+IP_API_FIELDS: Final = MappingProxyType({
+    'country': 'country',
+    'country_code': 'countryCode',
+    'region': 'regionName',
+    'city': 'city',
+    'timezone': 'timezone'
+})
+
+# Each entry: (URL template with {ip} placeholder, result field -> API response field)
+GEOLOCATION_APIS: Final = (
+    ('http://ip-api.com/json/{ip}', IP_API_FIELDS),
+    ('https://ipapi.co/{ip}/json/', MappingProxyType({
+        'country': 'country_name',
+        'country_code': 'country_code',
+        'region': 'region',
+        'city': 'city',
+        'timezone': 'timezone'
+    }))
+)
+
+GEO_API_FAILURE_THRESHOLD: Final = 5  # Consecutive failures before an API is skipped
+GEO_API_COOLDOWN: Final = 60  # Seconds a failing API is skipped before being tried again
+
+# Bulk endpoint taking a JSON list of IPs per POST
+GEOLOCATION_BATCH_API: Final = ('http://ip-api.com/batch', IP_API_FIELDS)
+GEOLOCATION_BATCH_SIZE: Final = 100  # Maximum IPs per batch request (ip-api.com limit)
+
+# Optional offline MaxMind GeoLite2-Country database; used before the HTTP APIs when present
+# (requires the maxminddb package)
+GEOIP_DATABASE_FILE: Final = os.path.join(DATA_DIR, 'GeoLite2-Country.mmdb')
+
+# HTTP Connection Pool Configuration
+HTTP_POOL_SIZE: Final = 64  # Keep-alive connections per host for geolocation API requests
+HTTP_MAX_RETRIES: Final = 2  # Retries for connection errors and 429/5xx responses
+HTTP_RETRY_BACKOFF: Final = 0.3  # Exponential backoff factor in seconds between retries
+HTTP_RETRY_BACKOFF_MAX: Final = 30  # Upper bound in seconds on a single backoff sleep
+HTTP_RETRY_JITTER: Final = 0.5  # Random seconds added to each backoff so retries don't synchronize
+
+# Geolocation Cache Configuration
+GEO_CACHE_SIZE: Final = 100000  # Maximum cached IP geolocation results
+GEO_CACHE_TTL: Final = 86400  # Cache lifetime in seconds for IP and domain geolocation results
+GEO_CACHE_FILE: Final = os.path.join(DATA_DIR, 'geo_cache.sqlite3')  # Persisted between runs when auto-resume is on
+GEO_BATCH_CONCURRENCY: Final = 50  # Emails geolocated concurrently by get_email_countries_batch
 
 # Rate Limiting
-MAX_REQUESTS_PER_MINUTE = 60
-RATE_LIMIT_DELAY = 1  # Delay in seconds when rate limit is hit
+MAX_REQUESTS_PER_MINUTE: Final = 60
+RATE_LIMIT_DELAY: Final = 1  # Delay in seconds when rate limit is hit
 
 # Error Handling
-MAX_RETRIES = 3
-RETRY_DELAY = 2  # Delay between retries in seconds
-CONTINUE_ON_ERROR = True
+MAX_RETRIES: Final = 3
+RETRY_DELAY: Final = 2  # Delay between retries in seconds
+CONTINUE_ON_ERROR: Final = True
 
 # Output Configuration
-OUTPUT_FORMATS = ['csv', 'txt']
-INCLUDE_DETAILED_RESULTS = True
-SEPARATE_FILES_BY_STATUS = True  # Create valid.txt, invalid.txt, skipped.txt
+OUTPUT_FORMATS: Final = ('csv', 'txt')
+INCLUDE_DETAILED_RESULTS: Final = True
+SEPARATE_FILES_BY_STATUS: Final = True  # Create valid.txt, invalid.txt, skipped.txt
 
 # Security Configuration
-VALIDATE_SSL_CERTIFICATES = True
-ALLOW_SELF_SIGNED_CERTIFICATES = False
+VALIDATE_SSL_CERTIFICATES: Final = True
+ALLOW_SELF_SIGNED_CERTIFICATES: Final = False
 
 # Performance Configuration
-MEMORY_LIMIT_MB = 500  # Maximum memory usage
-CHUNK_SIZE = 1000  # Number of emails to process before saving progress
+MEMORY_LIMIT_MB: Final = 500  # Maximum memory usage
+CHUNK_SIZE: Final = 1000  # Number of emails to process before saving progress
 
 # Progress Tracking
-SAVE_PROGRESS_EVERY_N_BATCHES = 5
-AUTO_RESUME_ON_RESTART = True
-CLEANUP_PROGRESS_ON_COMPLETION = True
+SAVE_PROGRESS_EVERY_N_BATCHES: Final = 5
+AUTO_RESUME_ON_RESTART: Final = True
+CLEANUP_PROGRESS_ON_COMPLETION: Final = True
 
 # Client-Specific Requirements
-SEND_TEST_EMAIL_FOR_VALID = True  # Send test email to verify working credentials
-REQUIRE_TEST_EMAIL_RECIPIENT = True  # Require test email recipient to be configured
-GENERATE_COUNTRY_REPORTS = True  # Generate country-based statistics
-PROXY_SUPPORT_ENABLED = True  # Enable proxy rotation support
+SEND_TEST_EMAIL_FOR_VALID: Final = True  # Send test email to verify working credentials
+REQUIRE_TEST_EMAIL_RECIPIENT: Final = True  # Require test email recipient to be configured
+GENERATE_COUNTRY_REPORTS: Final = True  # Generate country-based statistics
+PROXY_SUPPORT_ENABLED: Final = True  # Enable proxy rotation support
 
 # Feature Flags
-ENABLE_DUPLICATE_CHECKING = True
-ENABLE_HARD_BOUNCE_DETECTION = True
-ENABLE_SMTP_AVAILABILITY_CHECK = True
-ENABLE_MX_RECORD_VALIDATION = True
-ENABLE_MAILBOX_EXISTENCE_CHECK = True
\ No newline at end of file
+ENABLE_DUPLICATE_CHECKING: Final = True
+ENABLE_HARD_BOUNCE_DETECTION: Final = True
+ENABLE_SMTP_AVAILABILITY_CHECK: Final = True
+ENABLE_MX_RECORD_VALIDATION: Final = True
+ENABLE_MAILBOX_EXISTENCE_CHECK: Final = True
\ No newline at end of file
@@ -1,25 +1,264 @@
+import asyncio
+import atexit
+import dns.asyncresolver
+import dns.rdata
+import dns.rdataclass
+import dns.rdatatype
 import dns.resolver
+import json
+import logging
+import os
+import re
 import socket
-from typing import Dict, List, Optional
-from config import DNS_TIMEOUT
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import (
+    MAX_WORKERS, DNS_TIMEOUT, DNS_CACHE_SIZE, DNS_CACHE_MAX_TTL, DNS_NEGATIVE_CACHE_TTL,
+    DNS_BATCH_CONCURRENCY, DNS_MAX_CONCURRENCY, DNS_RBL_CACHE_TTL, SUSPICIOUS_DOMAIN_PATTERNS,
+    DNS_NAMESERVERS, DNS_ROTATE_NAMESERVERS, DNS_CACHE_FILE, AUTO_RESUME_ON_RESTART
+)
+from utils.cache import TTLCache, SingleFlight
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Single-pass prefilter for suspicious domain substrings
+_SUSPICIOUS_RE = re.compile('|'.join(map(re.escape, SUSPICIOUS_DOMAIN_PATTERNS)), re.IGNORECASE)
+
 class DNSChecker:
+    # Process-wide cap on resolver queries in flight; excess callers queue
+    _query_slots = threading.BoundedSemaphore(DNS_MAX_CONCURRENCY)
+    
     def __init__(self):
         self.timeout = DNS_TIMEOUT
         # Configure DNS resolver
         self.resolver = dns.resolver.Resolver()
         self.resolver.timeout = self.timeout
         self.resolver.lifetime = self.timeout
+        
+        # Async resolver for batch lookups on a single event loop
+        self.async_resolver = dns.asyncresolver.Resolver()
+        self.async_resolver.timeout = self.timeout
+        self.async_resolver.lifetime = self.timeout
+        
+        # Spread queries across several upstreams so one rate-limited resolver can't stall us;
+        # dnspython's own TTL-aware LRU cache also serves direct resolver calls and cache misses below
+        resolver_cache = dns.resolver.LRUCache(DNS_CACHE_SIZE)
+        for res in (self.resolver, self.async_resolver):
+            if DNS_NAMESERVERS:
+                res.nameservers = list(DNS_NAMESERVERS)
+            res.rotate = DNS_ROTATE_NAMESERVERS
+            res.cache = resolver_cache
+        
+        # Same upstreams without the cache, so get_domain_info times a real round trip
+        self._timing_resolver = dns.resolver.Resolver()
+        self._timing_resolver.timeout = self.timeout
+        self._timing_resolver.lifetime = self.timeout
+        if DNS_NAMESERVERS:
+            self._timing_resolver.nameservers = list(DNS_NAMESERVERS)
+        
+        # Per-record-type answer caches keyed by domain
+        self._a_cache = TTLCache(DNS_CACHE_SIZE)
+        self._mx_cache = TTLCache(DNS_CACHE_SIZE)
+        self._ns_cache = TTLCache(DNS_CACHE_SIZE)
+        self._txt_cache = TTLCache(DNS_CACHE_SIZE)
+        self._rbl_cache = TTLCache(DNS_CACHE_SIZE, default_ttl=DNS_RBL_CACHE_TTL)
+        # IPs whose reverse DNS was already logged, so repeat validations don't queue it again
+        self._reverse_seen = TTLCache(DNS_CACHE_SIZE, default_ttl=DNS_CACHE_MAX_TTL)
+        self._caches = {
+            'A': self._a_cache,
+            'MX': self._mx_cache,
+            'NS': self._ns_cache,
+            'TXT': self._txt_cache
+        }
+        # Concurrent identical lookups share a single resolver query
+        self._inflight = SingleFlight()
+        # asyncio.Semaphore is bound to one event loop, so keep one per loop
+        self._async_query_slots = weakref.WeakKeyDictionary()
+        # Runs the A/MX/NS lookups of each validated domain in parallel
+        self._lookup_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS * 3, thread_name_prefix='dns-lookup')
+        # Blocking libc lookups (reverse DNS, RBL, gethostbyname) get their own pool so
+        # bursts of them never queue ahead of resolver work or the validator's workers
+        self._dns_pool = ThreadPoolExecutor(max_workers=DNS_MAX_CONCURRENCY, thread_name_prefix='dns')
+        
+        # Warm-start from the previous run; answers are written back on exit
+        if AUTO_RESUME_ON_RESTART:
+            self.load_cache()
+            atexit.register(self.flush_cache)
+        
         logger.info("DNS checker initialized")
     
-    def validate_domain(self, domain: str) -> Dict:
-        """Comprehensive domain validation with DNS checks"""
-        logger.info(f"Validating domain: {domain}")
+    def load_cache(self):
+        """Load unexpired DNS answers persisted by a previous run"""
+        if not os.path.exists(DNS_CACHE_FILE):
+            return
+        
+        try:
+            now = time.time()
+            loaded = 0
+            with sqlite3.connect(DNS_CACHE_FILE) as conn:
+                rows = conn.execute(
+                    "SELECT domain, rdtype, records, expires_at FROM dns_cache WHERE expires_at > ?", (now,)
+                ).fetchall()
+            
+            for domain, rdtype, records, expires_at in rows:
+                cache = self._caches.get(rdtype)
+                if cache is None:
+                    continue
+                rdtype_value = dns.rdatatype.from_text(rdtype)
+                rdata = tuple(
+                    dns.rdata.from_text(dns.rdataclass.IN, rdtype_value, text)
+                    for text in json.loads(records)
+                )
+                cache.set(domain, rdata, expires_at - now)
+                loaded += 1
+            
+            logger.info(f"Loaded {loaded} cached DNS answers")
+        except Exception as e:
+            logger.error(f"Error loading DNS cache: {e}")
+    
+    def flush_cache(self):
+        """Persist all unexpired DNS answers so the next run can skip them"""
+        try:
+            # Cache expiry is monotonic; store wall-clock time so it survives restarts
+            offset = time.time() - time.monotonic()
+            rows = [
+                (domain, rdtype, json.dumps([rdata.to_text() for rdata in records]), expires_at + offset)
+                for rdtype, cache in self._caches.items()
+                for domain, records, expires_at in cache.items()
+            ]
+            
+            os.makedirs(os.path.dirname(DNS_CACHE_FILE), exist_ok=True)
+            with sqlite3.connect(DNS_CACHE_FILE) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS dns_cache ("
+                    "domain TEXT, rdtype TEXT, records TEXT, expires_at REAL, "
+                    "PRIMARY KEY (domain, rdtype))"
+                )
+                conn.execute("DELETE FROM dns_cache WHERE expires_at <= ?", (time.time(),))
+                conn.executemany("INSERT OR REPLACE INTO dns_cache VALUES (?, ?, ?, ?)", rows)
+            
+            logger.debug("Saved %s DNS answers to cache", len(rows))
+        except Exception as e:
+            logger.error(f"Error saving DNS cache: {e}")
+    
+    def _cached_resolve(self, domain: str, rdtype: str) -> Tuple:
+        """Resolve a record type through the TTL cache.
+        
+        Returns a tuple of rdata objects; an empty tuple means NXDOMAIN/no answer.
+        Other resolver errors (timeouts etc.) are raised and not cached.
+        """
+        cache = self._caches[rdtype]
+        key = domain.lower()
         
-        result = {
+        records = cache.get(key)
+        if records is not None:
+            logger.debug("DNS cache hit: %s %s", domain, rdtype)
+            return records
+        
+        return self._inflight.do(
+            (key, rdtype),
+            lambda: self._resolve_and_cache(domain, rdtype),
+            timeout=self.timeout
+        )
+    
+    def _resolve_and_cache(self, domain: str, rdtype: str) -> Tuple:
+        """Query the resolver and store the answer (or negative result) in the cache"""
+        cache = self._caches[rdtype]
+        key = domain.lower()
+        
+        # Another caller may have finished the same lookup while we were queued
+        records = cache.get(key)
+        if records is not None:
+            return records
+        
+        try:
+            with self._query_slots:
+                answer = self.resolver.resolve(domain, rdtype)
+            records = tuple(answer)
+            ttl = min(answer.rrset.ttl, DNS_CACHE_MAX_TTL)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            records = ()
+            ttl = DNS_NEGATIVE_CACHE_TTL
+        
+        cache.set(key, records, ttl)
+        return records
+    
+    async def _a_cached_resolve(self, domain: str, rdtype: str) -> Tuple:
+        """Async counterpart of _cached_resolve sharing the same caches"""
+        cache = self._caches[rdtype]
+        key = domain.lower()
+        
+        records = cache.get(key)
+        if records is not None:
+            return records
+        
+        try:
+            async with self._get_async_query_slots():
+                answer = await self.async_resolver.resolve(domain, rdtype)
+            records = tuple(answer)
+            ttl = min(answer.rrset.ttl, DNS_CACHE_MAX_TTL)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            records = ()
+            ttl = DNS_NEGATIVE_CACHE_TTL
+        
+        cache.set(key, records, ttl)
+        return records
+    
+    def _get_async_query_slots(self) -> asyncio.Semaphore:
+        """Get the query-limiting semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_query_slots.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(DNS_MAX_CONCURRENCY)
+            self._async_query_slots[loop] = semaphore
+        return semaphore
+    
+    def _build_mx_list(self, mx_records: Tuple) -> List[Dict]:
+        """Convert MX rdata into host/priority dicts sorted by priority"""
+        # Sort by (preference, host): lower preference = higher precedence, host breaks ties
+        # deterministically since dnspython does not guarantee answer order
+        return [
+            {'host': mx_host, 'priority': preference}
+            for preference, mx_host in self._sorted_mx(mx_records)
+        ]
+    
+    @staticmethod
+    def _sorted_mx(mx_records: Tuple) -> List[Tuple[int, str]]:
+        """Return (preference, host) pairs ordered by MX preference"""
+        return sorted((mx.preference, mx.exchange.to_text(omit_final_dot=True)) for mx in mx_records)
+    
+    def _schedule_reverse_lookup(self, a_future: Future):
+        """Done-callback for the A lookup: queue a reverse DNS lookup of its first IP"""
+        if a_future.cancelled() or a_future.exception() is not None:
+            return
+        a_records = a_future.result()
+        if a_records:
+            self._queue_reverse_lookup(str(a_records[0]))
+    
+    def _queue_reverse_lookup(self, ip_address: str):
+        """Queue a reverse DNS lookup of ip_address once; its only output is a debug log line"""
+        if not logger.isEnabledFor(logging.DEBUG) or self._reverse_seen.get(ip_address) is not None:
+            return
+        self._reverse_seen.set(ip_address, True)
+        self._dns_pool.submit(self._reverse_lookup, ip_address)
+    
+    def _reverse_lookup(self, ip_address: str):
+        """Reverse DNS lookup (informational only)"""
+        try:
+            reverse_dns = socket.gethostbyaddr(ip_address)
+            logger.debug("Reverse DNS for %s: %s", ip_address, reverse_dns[0])
+        except Exception as e:
+            logger.debug("Reverse DNS lookup failed for %s: %s", ip_address, e)
+    
+    def _empty_domain_result(self, domain: str) -> Dict:
+        """Result skeleton shared by the sync and async validators"""
+        return {
             'domain': domain,
             'is_valid': False,
             'has_a_record': False,
@@ -32,74 +271,68 @@ class DNSChecker:
             },
             'dns_errors': []
         }
+    
+    def validate_domain(self, domain: str) -> Dict:
+        """Comprehensive domain validation with DNS checks"""
+        logger.info(f"Validating domain: {domain}")
+        
+        result = self._empty_domain_result(domain)
         
         try:
+            # A, MX and NS lookups are independent, so issue them concurrently
+            logger.debug("Checking A, MX and NS records for %s", domain)
+            a_future = self._lookup_pool.submit(self._cached_resolve, domain, 'A')
+            mx_future = self._lookup_pool.submit(self._cached_resolve, domain, 'MX')
+            ns_future = self._lookup_pool.submit(self._cached_resolve, domain, 'NS')
+            
+            # Reverse DNS only depends on the A answer; chain it so it never blocks validation
+            a_future.add_done_callback(self._schedule_reverse_lookup)
+            
             # Step 1: Check A record (IP address)
             try:
-                logger.debug(f"Checking A record for {domain}")
-                a_records = self.resolver.resolve(domain, 'A')
+                a_records = a_future.result()
                 if a_records:
                     result['has_a_record'] = True
                     result['ip_address'] = str(a_records[0])
-                    logger.debug(f"A record found for {domain}: {result['ip_address']}")
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
-                logger.debug(f"No A record found for {domain}")
-                result['dns_errors'].append("No A record found")
+                    logger.debug("A record found for %s: %s", domain, result['ip_address'])
+                else:
+                    logger.debug("No A record found for %s", domain)
+                    result['dns_errors'].append("No A record found")
             except Exception as e:
-                logger.debug(f"A record lookup failed for {domain}: {e}")
+                logger.debug("A record lookup failed for %s: %s", domain, e)
                 result['dns_errors'].append(f"A record lookup error: {str(e)}")
             
             # Step 2: Check MX record (mail server)
             try:
-                logger.debug(f"Checking MX record for {domain}")
-                mx_records = self.resolver.resolve(domain, 'MX')
+                mx_records = mx_future.result()
                 if mx_records:
                     result['has_mx_record'] = True
                     result['mx_info']['has_mx'] = True
                     
-                    # Sort MX records by priority (lower priority = higher precedence)
-                    mx_list = []
-                    for mx in mx_records:
-                        mx_host = str(mx.exchange).rstrip('.')
-                        mx_list.append({
-                            'host': mx_host,
-                            'priority': mx.preference
-                        })
-                    
-                    # Sort by priority
-                    mx_list.sort(key=lambda x: x['priority'])
+                    mx_list = self._build_mx_list(mx_records)
                     result['mx_info']['mx_records'] = mx_list
                     
                     # Set primary MX server
                     if mx_list:
                         result['mx_info']['primary_mx'] = mx_list[0]['host']
-                        logger.debug(f"Primary MX server for {domain}: {result['mx_info']['primary_mx']}")
+                        logger.debug("Primary MX server for %s: %s", domain, result['mx_info']['primary_mx'])
+                else:
+                    logger.debug("No MX record found for %s", domain)
+                    result['dns_errors'].append("No MX record found")
                     
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
-                logger.debug(f"No MX record found for {domain}")
-                result['dns_errors'].append("No MX record found")
             except Exception as e:
-                logger.debug(f"MX record lookup failed for {domain}: {e}")
+                logger.debug("MX record lookup failed for %s: %s", domain, e)
                 result['dns_errors'].append(f"MX record lookup error: {str(e)}")
             
-            # Step 3: Additional DNS checks
+            # Step 3: Additional DNS checks (name servers)
             try:
-                # Check for NS records (name servers)
-                ns_records = self.resolver.resolve(domain, 'NS')
+                ns_records = ns_future.result()
                 if ns_records:
-                    logger.debug(f"NS records found for {domain}")
+                    logger.debug("NS records found for %s", domain)
             except Exception as e:
-                logger.debug(f"NS record lookup failed for {domain}: {e}")
+                logger.debug("NS record lookup failed for %s: %s", domain, e)
             
-            # Step 4: Reverse DNS lookup if IP is available
-            if result['ip_address']:
-                try:
-                    reverse_dns = socket.gethostbyaddr(result['ip_address'])
-                    logger.debug(f"Reverse DNS for {result['ip_address']}: {reverse_dns[0]}")
-                except Exception as e:
-                    logger.debug(f"Reverse DNS lookup failed for {result['ip_address']}: {e}")
-            
-            # Step 5: Determine overall validity
+            # Step 4: Determine overall validity
             # Domain is valid if it has either A record or MX record
             result['is_valid'] = result['has_a_record'] or result['has_mx_record']
             
@@ -114,27 +347,126 @@ class DNSChecker:
         
         return result
     
+    def check_a_record(self, domain: str) -> Dict:
+        """A record lookup through the shared cache"""
+        a_records = self._cached_resolve(domain, 'A')
+        return {
+            'domain': domain,
+            'has_a_record': bool(a_records),
+            'ips': [str(a) for a in a_records]
+        }
+    
+    async def a_check_a(self, domain: str) -> Dict:
+        """Async A record lookup"""
+        a_records = await self._a_cached_resolve(domain, 'A')
+        return {
+            'domain': domain,
+            'has_a_record': bool(a_records),
+            'ips': [str(a) for a in a_records]
+        }
+    
+    async def a_check_mx(self, domain: str) -> Dict:
+        """Async MX record lookup returning the same shape as result['mx_info']"""
+        mx_records = await self._a_cached_resolve(domain, 'MX')
+        mx_list = self._build_mx_list(mx_records)
+        return {
+            'has_mx': bool(mx_list),
+            'mx_records': mx_list,
+            'primary_mx': mx_list[0]['host'] if mx_list else None
+        }
+    
+    async def a_validate_domain(self, domain: str) -> Dict:
+        """Async counterpart of validate_domain; A, MX and NS are queried concurrently"""
+        logger.debug("Validating domain (async): %s", domain)
+        
+        result = self._empty_domain_result(domain)
+        
+        a_info, mx_info, ns_records = await asyncio.gather(
+            self.a_check_a(domain),
+            self.a_check_mx(domain),
+            self._a_cached_resolve(domain, 'NS'),
+            return_exceptions=True
+        )
+        
+        if isinstance(a_info, Exception):
+            result['dns_errors'].append(f"A record lookup error: {str(a_info)}")
+        elif a_info['has_a_record']:
+            result['has_a_record'] = True
+            result['ip_address'] = a_info['ips'][0]
+        else:
+            result['dns_errors'].append("No A record found")
+        
+        if isinstance(mx_info, Exception):
+            result['dns_errors'].append(f"MX record lookup error: {str(mx_info)}")
+        elif mx_info['has_mx']:
+            result['has_mx_record'] = True
+            result['mx_info'] = mx_info
+        else:
+            result['dns_errors'].append("No MX record found")
+        
+        if isinstance(ns_records, Exception):
+            logger.debug("NS record lookup failed for %s: %s", domain, ns_records)
+        
+        # Reverse DNS is informational only; queue it on the DNS pool without waiting for it
+        if result['ip_address']:
+            self._queue_reverse_lookup(result['ip_address'])
+        
+        result['is_valid'] = result['has_a_record'] or result['has_mx_record']
+        return result
+    
+    async def _gather_domains(self, domains: List[str], concurrency: int) -> List[Dict]:
+        """Validate domains concurrently with at most `concurrency` in flight"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def bounded(domain: str) -> Dict:
+            async with semaphore:
+                try:
+                    return await self.a_validate_domain(domain)
+                except Exception as e:
+                    logger.error(f"DNS validation failed for {domain}: {e}")
+                    result = self._empty_domain_result(domain)
+                    result['dns_errors'].append(f"DNS validation error: {str(e)}")
+                    return result
+        
+        return await asyncio.gather(*(bounded(domain) for domain in domains))
+    
+    def validate_domains_batch(self, domains: Iterable[str], concurrency: int = DNS_BATCH_CONCURRENCY) -> List[Dict]:
+        """Validate many domains on one event loop; results follow input order.
+        
+        Must be called from synchronous code (it starts its own event loop).
+        """
+        domains = list(domains)
+        results = self.validate_domains(domains, concurrency)
+        return [results[domain] for domain in domains]
+    
+    def validate_domains(self, domains: Iterable[str], concurrency: int = DNS_BATCH_CONCURRENCY) -> Dict[str, Dict]:
+        """Validate each distinct domain once, concurrently; returns results keyed by domain.
+        
+        Must be called from synchronous code (it starts its own event loop).
+        """
+        # Real email lists repeat a handful of provider domains many times
+        unique_domains = list(dict.fromkeys(domains))
+        logger.info(f"Validating {len(unique_domains)} unique domains (concurrency: {concurrency})")
+        results = asyncio.run(self._gather_domains(unique_domains, concurrency))
+        return dict(zip(unique_domains, results))
+    
     def get_mx_records(self, domain: str) -> List[Dict]:
         """Get MX records for a domain"""
-        logger.debug(f"Getting MX records for {domain}")
+        logger.debug("Getting MX records for %s", domain)
         
         mx_records = []
         
         try:
-            mx_answers = self.resolver.resolve(domain, 'MX')
+            mx_answers = self._cached_resolve(domain, 'MX')
             
-            for mx in mx_answers:
-                mx_host = str(mx.exchange).rstrip('.')
+            for preference, mx_host in self._sorted_mx(mx_answers):
                 mx_records.append({
                     'host': mx_host,
-                    'priority': mx.preference,
+                    'priority': preference,
                     'is_reachable': self._test_mx_reachability(mx_host)
                 })
             
-            # Sort by priority
-            mx_records.sort(key=lambda x: x['priority'])
-            
-            logger.debug(f"Found {len(mx_records)} MX records for {domain}")
+            logger.debug("Found %s MX records for %s", len(mx_records), domain)
             
         except Exception as e:
             logger.error(f"Failed to get MX records for {domain}: {e}")
@@ -144,28 +476,41 @@ class DNSChecker:
     def _test_mx_reachability(self, mx_host: str) -> bool:
         """Test if MX server is reachable"""
         try:
-            # Test common mail ports
-            ports_to_test = [25, 587, 465]
-            
-            for port in ports_to_test:
-                try:
-                    sock = socket.create_connection((mx_host, port), timeout=3)
-                    sock.close()
-                    logger.debug(f"MX server {mx_host}:{port} is reachable")
-                    return True
-                except Exception:
-                    continue
-            
-            logger.debug(f"MX server {mx_host} is not reachable on any port")
-            return False
-            
+            return asyncio.run(self._a_test_mx_reachability(mx_host))
         except Exception as e:
-            logger.debug(f"Failed to test MX reachability for {mx_host}: {e}")
+            logger.debug("Failed to test MX reachability for %s: %s", mx_host, e)
             return False
     
+    async def _a_probe_port(self, mx_host: str, port: int) -> int:
+        """Open and close a TCP connection; raises if the port is unreachable"""
+        _, writer = await asyncio.wait_for(asyncio.open_connection(mx_host, port), timeout=3)
+        writer.close()
+        return port
+    
+    async def _a_test_mx_reachability(self, mx_host: str) -> bool:
+        """Async MX reachability test; all mail ports are probed concurrently"""
+        # Test common mail ports
+        ports_to_test = [25, 587, 465]
+        
+        pending = {asyncio.ensure_future(self._a_probe_port(mx_host, port)) for port in ports_to_test}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        logger.debug("MX server %s:%s is reachable", mx_host, task.result())
+                        return True
+        finally:
+            # First success wins; drop the slower probes
+            for task in pending:
+                task.cancel()
+        
+        logger.debug("MX server %s is not reachable on any port", mx_host)
+        return False
+    
     def check_domain_reputation(self, domain: str) -> Dict:
         """Check domain reputation using DNS-based checks"""
-        logger.debug(f"Checking domain reputation for {domain}")
+        logger.debug("Checking domain reputation for %s", domain)
         
         reputation = {
             'domain': domain,
@@ -176,6 +521,9 @@ class DNSChecker:
         }
         
         try:
+            # The domain age heuristic is an independent TXT lookup; overlap it with the RBL checks
+            new_domain_future = self._lookup_pool.submit(self._is_new_domain, domain)
+            
             # Check against common DNS blacklists
             blacklists = [
                 'zen.spamhaus.org',
@@ -185,32 +533,35 @@ class DNSChecker:
             
             # Get domain IP for blacklist checking
             try:
-                ip_address = socket.gethostbyname(domain)
+                ip_address = self._dns_pool.submit(socket.gethostbyname, domain).result(timeout=self.timeout)
+                
+                # Query all blacklists concurrently; wall time is the slowest single lookup
+                futures = [
+                    self._dns_pool.submit(self._check_blacklist, ip_address, blacklist)
+                    for blacklist in blacklists
+                ]
                 
-                for blacklist in blacklists:
-                    if self._check_blacklist(ip_address, blacklist):
+                for blacklist, future in zip(blacklists, futures):
+                    if future.result():
                         reputation['blacklist_status'].append(blacklist)
                         reputation['reputation_score'] -= 30
                         reputation['is_suspicious'] = True
                 
             except Exception as e:
-                logger.debug(f"Failed to get IP for domain reputation check: {e}")
+                logger.debug("Failed to get IP for domain reputation check: %s", e)
             
-            # Check for suspicious domain patterns
-            suspicious_patterns = [
-                'temp', 'temporary', 'disposable', 'fake', 'test',
-                'spam', 'trash', 'junk', 'throwaway'
-            ]
-            
-            domain_lower = domain.lower()
-            for pattern in suspicious_patterns:
-                if pattern in domain_lower:
-                    reputation['warnings'].append(f"Suspicious pattern detected: {pattern}")
-                    reputation['reputation_score'] -= 10
-                    reputation['is_suspicious'] = True
+            # Check for suspicious domain patterns; the regex rejects clean domains in one scan,
+            # and only matching domains pay for the per-pattern pass (patterns may overlap, e.g. temp/temporary)
+            if _SUSPICIOUS_RE.search(domain):
+                domain_lower = domain.lower()
+                for pattern in SUSPICIOUS_DOMAIN_PATTERNS:
+                    if pattern in domain_lower:
+                        reputation['warnings'].append(f"Suspicious pattern detected: {pattern}")
+                        reputation['reputation_score'] -= 10
+                        reputation['is_suspicious'] = True
             
             # Check domain age (simplified - would need WHOIS in real implementation)
-            if self._is_new_domain(domain):
+            if new_domain_future.result():
                 reputation['warnings'].append("Domain appears to be relatively new")
                 reputation['reputation_score'] -= 5
             
@@ -221,6 +572,11 @@ class DNSChecker:
     
     def _check_blacklist(self, ip_address: str, blacklist: str) -> bool:
         """Check if IP is in DNS blacklist"""
+        cache_key = (ip_address, blacklist)
+        listed = self._rbl_cache.get(cache_key)
+        if listed is not None:
+            return listed
+        
         try:
             # Reverse IP for blacklist query
             reversed_ip = '.'.join(reversed(ip_address.split('.')))
@@ -228,27 +584,30 @@ class DNSChecker:
             
             # Try to resolve the blacklist query
             socket.gethostbyname(query_host)
-            return True  # If resolution succeeds, IP is blacklisted
+            listed = True  # If resolution succeeds, IP is blacklisted
             
         except socket.gaierror:
-            return False  # If resolution fails, IP is not blacklisted
+            listed = False  # If resolution fails, IP is not blacklisted
         except Exception as e:
-            logger.debug(f"Blacklist check failed for {ip_address} against {blacklist}: {e}")
+            logger.debug("Blacklist check failed for %s against %s: %s", ip_address, blacklist, e)
             return False
+        
+        self._rbl_cache.set(cache_key, listed)
+        return listed
     
     def _is_new_domain(self, domain: str) -> bool:
         """Simple heuristic to detect potentially new domains"""
         # This is a simplified check - a real implementation would use WHOIS
         try:
             # Check if domain has minimal DNS infrastructure
-            txt_records = self.resolver.resolve(domain, 'TXT')
+            txt_records = self._cached_resolve(domain, 'TXT')
             return len(txt_records) < 2  # New domains often have minimal TXT records
         except:
             return True  # If we can't check, assume it might be new
     
     def get_domain_info(self, domain: str) -> Dict:
         """Get comprehensive domain information"""
-        logger.debug(f"Getting comprehensive domain info for {domain}")
+        logger.debug("Getting comprehensive domain info for %s", domain)
         
         info = {
             'domain': domain,
@@ -258,13 +617,18 @@ class DNSChecker:
             'dns_response_time': 0
         }
         
-        # Measure DNS response time
-        import time
-        start_time = time.time()
+        # Measure DNS response time; the shared resolver cache would make this a no-op
+        start_time = time.perf_counter()
         try:
-            self.resolver.resolve(domain, 'A')
+            self._timing_resolver.resolve(domain, 'A')
         except:
             pass
-        info['dns_response_time'] = time.time() - start_time
+        info['dns_response_time'] = time.perf_counter() - start_time
         
-        return info
\ No newline at end of file
+        return info
+
+
+@lru_cache(maxsize=None)
+def get_dns_checker() -> DNSChecker:
+    """Process-wide DNSChecker so caches, in-flight lookups and query limits are shared"""
+    return DNSChecker()
@@ -1,50 +1,456 @@
+import asyncio
+import dns.exception
+import idna
+import ipaddress
+import json
+import os
 import requests
 import socket
+import sqlite3
+import threading
 import time
-from typing import Dict, Optional, List
-from config import GEOLOCATION_APIS, TIMEOUT
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from config import (
+    GEOLOCATION_APIS, TIMEOUT, GEO_CACHE_SIZE, GEO_CACHE_TTL, GEO_CACHE_FILE,
+    GEO_API_FAILURE_THRESHOLD, GEO_API_COOLDOWN,
+    DNS_CACHE_MAX_TTL, DNS_NEGATIVE_CACHE_TTL, AUTO_RESUME_ON_RESTART,
+    HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_RETRY_BACKOFF, HTTP_RETRY_BACKOFF_MAX, HTTP_RETRY_JITTER,
+    MAX_WORKERS, GEO_BATCH_CONCURRENCY, GEOLOCATION_BATCH_API, GEOLOCATION_BATCH_SIZE, GEOIP_DATABASE_FILE
+)
+from core.dns_checker import DNSChecker, get_dns_checker
+from core.proxy_manager import ProxyManager
+from utils.cache import TTLCache, SingleFlight
 from utils.logger import setup_logger
 
+try:
+    import maxminddb
+except ImportError:
+    maxminddb = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = setup_logger(__name__)
 
+# Country code TLDs keyed by the last label - COMPREHENSIVE LIST
+_COUNTRY_TLDS: Mapping[str, Tuple[str, str]] = MappingProxyType({
+    # Major countries
+    'uk': ('United Kingdom', 'GB'),
+    'us': ('United States', 'US'),
+    'ca': ('Canada', 'CA'),
+    'au': ('Australia', 'AU'),
+    'de': ('Germany', 'DE'),
+    'fr': ('France', 'FR'),
+    'jp': ('Japan', 'JP'),
+    'cn': ('China', 'CN'),
+    'ru': ('Russia', 'RU'),
+    'in': ('India', 'IN'),
+    'br': ('Brazil', 'BR'),
+    'it': ('Italy', 'IT'),
+    'es': ('Spain', 'ES'),
+    'nl': ('Netherlands', 'NL'),
+    'mx': ('Mexico', 'MX'),
+    'kr': ('South Korea', 'KR'),
+    'hn': ('Honduras', 'HN'),
+    'pk': ('Pakistan', 'PK'),
+    'bd': ('Bangladesh', 'BD'),
+    'ar': ('Argentina', 'AR'),
+    'cl': ('Chile', 'CL'),
+    'co': ('Colombia', 'CO'),
+    'pe': ('Peru', 'PE'),
+    've': ('Venezuela', 'VE'),
+    'th': ('Thailand', 'TH'),
+    'sg': ('Singapore', 'SG'),
+    'my': ('Malaysia', 'MY'),
+    'id': ('Indonesia', 'ID'),
+    'ph': ('Philippines', 'PH'),
+    'vn': ('Vietnam', 'VN'),
+    'tw': ('Taiwan', 'TW'),
+    'hk': ('Hong Kong', 'HK'),
+    'nz': ('New Zealand', 'NZ'),
+    'za': ('South Africa', 'ZA'),
+    'eg': ('Egypt', 'EG'),
+    'ng': ('Nigeria', 'NG'),
+    'ke': ('Kenya', 'KE'),
+    'se': ('Sweden', 'SE'),
+    'no': ('Norway', 'NO'),
+    'dk': ('Denmark', 'DK'),
+    'fi': ('Finland', 'FI'),
+    'pl': ('Poland', 'PL'),
+    'ch': ('Switzerland', 'CH'),
+    'at': ('Austria', 'AT'),
+    'be': ('Belgium', 'BE'),
+    'pt': ('Portugal', 'PT'),
+    'gr': ('Greece', 'GR'),
+    'cz': ('Czech Republic', 'CZ'),
+    'hu': ('Hungary', 'HU'),
+    'ro': ('Romania', 'RO'),
+    'bg': ('Bulgaria', 'BG'),
+    'hr': ('Croatia', 'HR'),
+    'sk': ('Slovakia', 'SK'),
+    'si': ('Slovenia', 'SI'),
+    'ee': ('Estonia', 'EE'),
+    'lv': ('Latvia', 'LV'),
+    'lt': ('Lithuania', 'LT'),
+    'ie': ('Ireland', 'IE'),
+    'is': ('Iceland', 'IS'),
+    'tr': ('Turkey', 'TR'),
+    'il': ('Israel', 'IL'),
+    'sa': ('Saudi Arabia', 'SA'),
+    'ae': ('United Arab Emirates', 'AE'),
+    'ir': ('Iran', 'IR'),
+    'iq': ('Iraq', 'IQ'),
+    'jo': ('Jordan', 'JO'),
+    'lb': ('Lebanon', 'LB'),
+    'sy': ('Syria', 'SY'),
+    'kw': ('Kuwait', 'KW'),
+    'qa': ('Qatar', 'QA'),
+    'bh': ('Bahrain', 'BH'),
+    'om': ('Oman', 'OM'),
+    'ye': ('Yemen', 'YE')
+})
+
+# Multi-level country domains keyed by their last two labels
+_MULTI_LEVEL_TLDS: Mapping[Tuple[str, str], Tuple[str, str]] = MappingProxyType({
+    ('co', 'uk'): ('United Kingdom', 'GB'),
+    ('co', 'jp'): ('Japan', 'JP'),
+    ('co', 'kr'): ('South Korea', 'KR'),
+    ('co', 'in'): ('India', 'IN'),
+    ('co', 'za'): ('South Africa', 'ZA'),
+    ('com', 'au'): ('Australia', 'AU'),
+    ('com', 'br'): ('Brazil', 'BR'),
+    ('com', 'mx'): ('Mexico', 'MX'),
+    ('com', 'ar'): ('Argentina', 'AR'),
+    ('com', 'cn'): ('China', 'CN'),
+    ('com', 'tw'): ('Taiwan', 'TW'),
+    ('com', 'hk'): ('Hong Kong', 'HK'),
+    ('com', 'sg'): ('Singapore', 'SG'),
+    ('com', 'my'): ('Malaysia', 'MY'),
+    ('com', 'ph'): ('Philippines', 'PH'),
+    ('com', 'th'): ('Thailand', 'TH'),
+    ('com', 'vn'): ('Vietnam', 'VN'),
+    ('com', 'pk'): ('Pakistan', 'PK'),
+    ('com', 'bd'): ('Bangladesh', 'BD'),
+    ('gov', 'mx'): ('Mexico', 'MX'),
+    ('gob', 'mx'): ('Mexico', 'MX'),
+    ('sch', 'uk'): ('United Kingdom', 'GB'),
+    ('ac', 'uk'): ('United Kingdom', 'GB'),
+    ('gov', 'uk'): ('United Kingdom', 'GB'),
+    ('ne', 'jp'): ('Japan', 'JP'),
+    ('or', 'jp'): ('Japan', 'JP'),
+    ('ac', 'jp'): ('Japan', 'JP'),
+    ('go', 'jp'): ('Japan', 'JP'),
+    ('ed', 'jp'): ('Japan', 'JP')
+})
+
+# Known email providers and their primary countries
+_PROVIDER_COUNTRIES: Mapping[str, Tuple[str, str]] = MappingProxyType({
+    'gmail.com': ('United States', 'US'),
+    'yahoo.com': ('United States', 'US'),
+    'yahoo.co.uk': ('United Kingdom', 'GB'),
+    'yahoo.co.jp': ('Japan', 'JP'),
+    'yahoo.de': ('Germany', 'DE'),
+    'yahoo.fr': ('France', 'FR'),
+    'yahoo.ca': ('Canada', 'CA'),
+    'yahoo.com.au': ('Australia', 'AU'),
+    'hotmail.com': ('United States', 'US'),
+    'hotmail.co.uk': ('United Kingdom', 'GB'),
+    'hotmail.de': ('Germany', 'DE'),
+    'hotmail.fr': ('France', 'FR'),
+    'outlook.com': ('United States', 'US'),
+    'live.com': ('United States', 'US'),
+    'live.co.uk': ('United Kingdom', 'GB'),
+    'aol.com': ('United States', 'US'),
+    'aol.co.uk': ('United Kingdom', 'GB')
+})
+
+# Result status -> country statistics bucket; anything else counts as skipped
+_STATUS_BUCKETS: Mapping[str, str] = MappingProxyType({
+    'VALID': 'valid',
+    'INVALID': 'invalid'
+})
+
+# Above this many results, country statistics are aggregated with pandas
+_STATS_PANDAS_THRESHOLD = 1000
+
+
+def _country_result(info: Tuple[str, str]) -> Dict:
+    """Build a result dict from a (country, country_code) table entry"""
+    return {
+        'country': info[0],
+        'country_code': info[1],
+        'region': 'Unknown',
+        'city': 'Unknown'
+    }
+
+
+def _email_domain(email: str) -> str:
+    """Extract the lowercased, IDNA-encoded domain once so every lookup sees the same key"""
+    domain = email.rpartition('@')[2]
+    if not domain.isascii():
+        # Punycode matches the ASCII table keys and what the resolver would send anyway
+        try:
+            return idna.encode(domain, uts46=True).decode('ascii')
+        except idna.IDNAError:
+            pass
+    return domain.lower()
+
+
+# Errors meaning the proxy itself could not be used, as opposed to the API misbehaving
+_PROXY_ERRORS = (requests.exceptions.ProxyError, requests.exceptions.ConnectTimeout)
+
+
+def _country_status_pair(result: Dict) -> Tuple[str, str]:
+    """(country, status bucket) for a result; None counts as missing, like the pandas path's fillna"""
+    country = result.get('country')
+    status = result.get('status')
+    return (
+        'Unknown' if country is None else country,
+        _STATUS_BUCKETS.get('INVALID' if status is None else status, 'skipped')
+    )
+
+
 class GeoLocator:
-    def __init__(self):
+    # Copied for every lookup rather than rebuilding the literal each time
+    _RESULT_TEMPLATE: Mapping[str, Optional[str]] = MappingProxyType({
+        'email': None,
+        'country': 'Unknown',
+        'country_code': 'XX',
+        'region': 'Unknown',
+        'city': 'Unknown',
+        'ip_address': None,
+        'method': 'none'
+    })
+    
+    def __init__(self, dns_checker: Optional[DNSChecker] = None, proxy_manager: Optional[ProxyManager] = None):
         self.timeout = TIMEOUT
+        # Share the DNS checker's cache/single-flight/concurrency limits for A lookups
+        self.dns_checker = dns_checker or get_dns_checker()
+        # Parses proxy strings, and proxied API calls report their outcome here so dead proxies get rotated out
+        self.proxy_manager = proxy_manager if proxy_manager is not None else ProxyManager()
         self.apis = GEOLOCATION_APIS
+        
+        # Pooled keep-alive session so API calls skip TCP/TLS setup after the first request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=HTTP_MAX_RETRIES,
+                backoff_factor=HTTP_RETRY_BACKOFF,
+                backoff_max=HTTP_RETRY_BACKOFF_MAX,
+                backoff_jitter=HTTP_RETRY_JITTER,
+                status_forcelist=[429, 500, 502, 503, 504],
+                # The batch endpoint is a read-only POST, safe to repeat
+                allowed_methods=frozenset({'GET', 'POST'})
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Email-Validator/1.0',
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'gzip'
+        })
+        
+        # Optional offline GeoLite2 database, memory-mapped so lookups never touch the network
+        self._mmdb = None
+        if maxminddb and os.path.exists(GEOIP_DATABASE_FILE):
+            try:
+                self._mmdb = maxminddb.open_database(GEOIP_DATABASE_FILE, maxminddb.MODE_MMAP)
+                logger.info(f"Using offline GeoIP database: {GEOIP_DATABASE_FILE}")
+            except Exception as e:
+                logger.error(f"Error opening GeoIP database: {e}")
+        
+        # Per-API [consecutive failures, cooldown deadline] so a dead API isn't raced on every lookup
+        self._api_health: Dict[str, List[float]] = {api_url: [0, 0.0] for api_url, _ in self.apis}
+        self._api_health_lock = threading.Lock()
+        
+        # One slot per API for every validator worker so races never queue behind each other
+        self._api_pool = ThreadPoolExecutor(
+            max_workers=len(self.apis) * MAX_WORKERS, thread_name_prefix='geo-api'
+        )
+        
+        # Bounded pool for the blocking work (SQLite, system resolver, API race) of the async path
+        self._executor = ThreadPoolExecutor(
+            max_workers=GEO_BATCH_CONCURRENCY, thread_name_prefix='geo-async'
+        )
+        
+        # Country data is quasi-static and many emails share provider IPs
+        self._ip_geo_cache = TTLCache(GEO_CACHE_SIZE, default_ttl=GEO_CACHE_TTL)
+        self._domain_ip_cache = TTLCache(GEO_CACHE_SIZE, default_ttl=DNS_CACHE_MAX_TTL)
+        # The network-derived answer depends only on the domain, so every address at it shares one entry
+        self._domain_geo_cache = TTLCache(GEO_CACHE_SIZE, default_ttl=GEO_CACHE_TTL)
+        self._cache_dirty = False
+        # Workers looking up the same domain/IP at once share one lookup
+        self._inflight = SingleFlight()
+        self._a_inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        
+        # Results persist in SQLite across runs so resumed batches skip DNS and HTTP
+        self._db = None
+        self._db_lock = threading.Lock()
+        if AUTO_RESUME_ON_RESTART:
+            try:
+                self._db = self._open_db()
+            except Exception as e:
+                logger.error(f"Error opening geolocation cache: {e}")
+            self.load_cache()
+        
         logger.info("Geo locator initialized")
     
+    def _open_db(self) -> sqlite3.Connection:
+        """Open the persistent geolocation cache shared by worker threads"""
+        os.makedirs(os.path.dirname(GEO_CACHE_FILE), exist_ok=True)
+        db = sqlite3.connect(GEO_CACHE_FILE, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS geo (domain TEXT PRIMARY KEY, ip TEXT, country TEXT, "
+            "country_code TEXT, region TEXT, city TEXT, method TEXT, ts INTEGER)"
+        )
+        db.execute("CREATE TABLE IF NOT EXISTS geo_ip (ip TEXT PRIMARY KEY, geo TEXT, expires_at REAL)")
+        return db
+    
+    def load_cache(self):
+        """Load persisted IP geolocation results, skipping expired entries"""
+        if self._db is None:
+            return
+        
+        try:
+            now = time.time()
+            with self._db_lock:
+                rows = self._db.execute(
+                    "SELECT ip, geo, expires_at FROM geo_ip WHERE expires_at > ?", (now,)
+                ).fetchall()
+            
+            for ip_address, geo, expires_at in rows:
+                self._ip_geo_cache.set(ip_address, json.loads(geo), expires_at - now)
+            
+            logger.info(f"Loaded {len(rows)} cached geolocation results")
+        except Exception as e:
+            logger.error(f"Error loading geolocation cache: {e}")
+    
+    def save_cache(self):
+        """Persist IP geolocation results if any were added since the last save"""
+        if self._db is None or not self._cache_dirty:
+            return
+        
+        try:
+            # Cache expiry is monotonic; store wall-clock time so it survives restarts
+            offset = time.time() - time.monotonic()
+            rows = [
+                (ip_address, json.dumps(geo), expires_at + offset)
+                for ip_address, geo, expires_at in self._ip_geo_cache.items()
+            ]
+            
+            with self._db_lock:
+                self._db.execute("BEGIN")
+                self._db.execute("DELETE FROM geo_ip WHERE expires_at <= ?", (time.time(),))
+                self._db.executemany("INSERT OR REPLACE INTO geo_ip VALUES (?, ?, ?)", rows)
+                self._db.execute("COMMIT")
+            
+            self._cache_dirty = False
+            logger.debug("Saved %s geolocation results to cache", len(rows))
+        except Exception as e:
+            logger.error(f"Error saving geolocation cache: {e}")
+    
+    def _apply_cached_country(self, result: Dict, domain: str) -> bool:
+        """Fill result from an earlier network lookup for this domain, if still fresh"""
+        cached = self._domain_geo_cache.get(domain)
+        if cached is not None:
+            result.update(cached)
+            return True
+        
+        if self._db is None:
+            return False
+        
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT ip, country, country_code, region, city, method FROM geo WHERE domain = ? AND ts > ?",
+                    (domain, int(time.time() - GEO_CACHE_TTL))
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Geolocation cache read failed for %s: %s", domain, e)
+            return False
+        
+        if row is None:
+            return False
+        
+        geo_info = dict(zip(('ip_address', 'country', 'country_code', 'region', 'city', 'method'), row))
+        self._domain_geo_cache.set(domain, geo_info)
+        result.update(geo_info)
+        return True
+    
+    def _store_domain_country(self, domain: str, result: Dict):
+        """Remember a network-derived country for domain, in memory and across runs"""
+        self._domain_geo_cache.set(domain, {key: value for key, value in result.items() if key != 'email'})
+        if self._db is None:
+            return
+        
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geo VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (domain, result['ip_address'], result['country'], result['country_code'],
+                     result['region'], result['city'], result['method'], int(time.time()))
+                )
+        except sqlite3.Error as e:
+            logger.debug("Geolocation cache write failed for %s: %s", domain, e)
+    
+    def _empty_country_result(self, email: str) -> Dict:
+        """Result skeleton shared by the sync and async lookups"""
+        result = self._RESULT_TEMPLATE.copy()
+        result['email'] = email
+        return result
+    
+    def _apply_static_country(self, result: Dict, domain: str) -> bool:
+        """Fill result from TLD/provider tables; returns False if network lookup is needed"""
+        # PRIORITY 1: Try domain-based country detection (TLD analysis)
+        country_info = self._get_domain_country(domain)
+        if country_info:
+            result.update(country_info)
+            result['method'] = 'domain_tld'
+            logger.debug("TLD-based country for %s: %s", result['email'], result['country'])
+            return True
+        
+        # PRIORITY 2: Try known provider countries (full-domain match)
+        provider_info = _PROVIDER_COUNTRIES.get(domain)
+        if provider_info:
+            result['country'], result['country_code'] = provider_info
+            result['method'] = 'provider_database'
+            logger.debug("Provider-based country for %s: %s", result['email'], result['country'])
+            return True
+        
+        return False
+    
     def get_email_country(self, email: str, proxy: Optional[str] = None) -> Dict:
         """Get country information for an email address"""
-        logger.debug(f"Getting country for email: {email}")
+        logger.debug("Getting country for email: %s", email)
         
-        result = {
-            'email': email,
-            'country': 'Unknown',
-            'country_code': 'XX',
-            'region': 'Unknown',
-            'city': 'Unknown',
-            'ip_address': None,
-            'method': 'none'
-        }
+        result = self._empty_country_result(email)
         
         try:
             # Extract domain from email
-            domain = email.split('@')[1] if '@' in email else email
-            
-            # PRIORITY 1: Try domain-based country detection (TLD analysis)
-            country_info = self._get_domain_country(domain)
-            if country_info:
-                result.update(country_info)
-                result['method'] = 'domain_tld'
-                logger.debug(f"TLD-based country for {email}: {result['country']}")
+            domain = _email_domain(email)
+            if not domain:
                 return result
             
-            # PRIORITY 2: Try known provider countries
-            provider_country = self._get_provider_country(domain)
-            if provider_country:
-                result.update(provider_country)
-                result['method'] = 'provider_database'
-                logger.debug(f"Provider-based country for {email}: {result['country']}")
+            if self._apply_static_country(result, domain) or self._apply_cached_country(result, domain):
                 return result
             
             # PRIORITY 3: Try to get IP address from domain (LAST RESORT)
@@ -57,314 +463,488 @@ class GeoLocator:
                 if geo_info:
                     result.update(geo_info)
                     result['method'] = 'ip_geolocation'
-                    logger.debug(f"IP-based geolocation for {email}: {result['country']}")
+                    logger.debug("IP-based geolocation for %s: %s", email, result['country'])
+                    self._store_domain_country(domain, result)
                     return result
             
         except Exception as e:
             logger.error(f"Error getting country for {email}: {e}")
         
-        logger.debug(f"Could not determine country for {email}")
+        logger.debug("Could not determine country for %s", email)
         return result
     
-    def _get_domain_ip(self, domain: str) -> Optional[str]:
-        """Get IP address for a domain"""
+    async def get_email_country_async(self, email: str, proxy: Optional[str] = None,
+                                      session: Optional['aiohttp.ClientSession'] = None) -> Dict:
+        """Async counterpart of get_email_country; DNS runs on the event loop.
+        
+        With an aiohttp session the geolocation APIs are queried on the loop too; otherwise
+        blocking steps are offloaded to a bounded thread pool so the loop never stalls.
+        """
+        result = self._empty_country_result(email)
+        
         try:
-            # Remove www. prefix if present
-            if domain.startswith('www.'):
-                domain = domain[4:]
+            domain = _email_domain(email)
+            if not domain:
+                return result
+            
+            if self._apply_static_country(result, domain):
+                return result
+            
+            loop = asyncio.get_running_loop()
+            if await loop.run_in_executor(self._executor, self._apply_cached_country, result, domain):
+                return result
+            
+            ip_address = await self._a_get_domain_ip(domain)
+            if ip_address:
+                result['ip_address'] = ip_address
+                
+                if session is not None:
+                    geo_info = await self._a_get_ip_geolocation(ip_address, proxy, session)
+                else:
+                    # The API race runs on its own thread pool; don't block the loop waiting for it
+                    geo_info = await loop.run_in_executor(self._executor, self._get_ip_geolocation, ip_address, proxy)
+                if geo_info:
+                    result.update(geo_info)
+                    result['method'] = 'ip_geolocation'
+                    self._store_domain_country(domain, result)
+                    return result
             
-            ip_address = socket.gethostbyname(domain)
-            logger.debug(f"IP address for {domain}: {ip_address}")
-            return ip_address
         except Exception as e:
-            logger.debug(f"Failed to get IP for {domain}: {e}")
-            return None
+            logger.error(f"Error getting country for {email}: {e}")
+        
+        return result
     
-    def _get_ip_geolocation(self, ip_address: str, proxy: Optional[str] = None) -> Optional[Dict]:
-        """Get geolocation information for an IP address"""
-        logger.debug(f"Getting geolocation for IP: {ip_address}")
+    def get_email_countries_batch(self, emails: Iterable[str], proxy: Optional[str] = None,
+                                  concurrency: int = GEO_BATCH_CONCURRENCY) -> List[Dict]:
+        """Look up many emails on one event loop; results follow input order.
         
-        # Skip private/local IPs
-        if self._is_private_ip(ip_address):
-            logger.debug(f"Skipping private IP: {ip_address}")
+        Must be called from synchronous code (it starts its own event loop).
+        """
+        emails = list(emails)
+        logger.info(f"Getting countries for {len(emails)} emails (concurrency: {concurrency})")
+        
+        async def gather() -> List[Dict]:
+            semaphore = asyncio.Semaphore(concurrency)
+            session = self.open_aio_session()
+            
+            async def bounded(email: str) -> Dict:
+                async with semaphore:
+                    return await self.get_email_country_async(email, proxy, session)
+            
+            try:
+                return await asyncio.gather(*(bounded(email) for email in emails))
+            finally:
+                if session is not None:
+                    await session.close()
+        
+        return asyncio.run(gather())
+    
+    def open_aio_session(self) -> Optional['aiohttp.ClientSession']:
+        """Create an aiohttp session for the current event loop, or None without aiohttp"""
+        if aiohttp is None:
             return None
         
-        # Setup proxy if provided
-        proxies = None
-        if proxy:
-            proxies = {
-                'http': f'http://{proxy}',
-                'https': f'http://{proxy}'
-            }
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=HTTP_POOL_SIZE),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': self.session.headers['User-Agent']}
+        )
+    
+    def get_countries_bulk(self, emails: Iterable[str], proxy: Optional[str] = None) -> List[Dict]:
+        """Get country information for many emails using the batch geolocation endpoint.
+        
+        Domains are deduplicated and resolved concurrently; IPs without a cached
+        result are geolocated GEOLOCATION_BATCH_SIZE at a time. Results follow input order.
+        """
+        emails = list(emails)
+        results = [self._empty_country_result(email) for email in emails]
+        
+        # TLD/provider tables answer most emails without any network I/O
+        pending: Dict[str, List[Dict]] = {}
+        for result in results:
+            email = result['email']
+            domain = _email_domain(email)
+            if not domain:
+                continue
+            if not (self._apply_static_country(result, domain) or self._apply_cached_country(result, domain)):
+                pending.setdefault(domain, []).append(result)
+        
+        if not pending:
+            return results
+        
+        domain_ips = self._resolve_domain_ips(list(pending))
+        
+        ips = {ip for ip in domain_ips.values() if ip and not self._is_private_ip(ip)}
+        geo_by_ip = {}
+        for ip_address in ips:
+            cached = self._local_geolocation(ip_address) or self._ip_geo_cache.get(ip_address)
+            if cached is not None:
+                geo_by_ip[ip_address] = cached
+        
+        misses = [ip_address for ip_address in ips if ip_address not in geo_by_ip]
+        geo_by_ip.update(self._batch_geolocate(misses, proxy))
         
-        # Try multiple geolocation APIs
-        for api_url in self.apis:
+        # Anything the batch endpoint could not answer falls back to the per-IP APIs
+        for ip_address in misses:
+            if ip_address not in geo_by_ip:
+                geo_info = self._get_ip_geolocation(ip_address, proxy)
+                if geo_info:
+                    geo_by_ip[ip_address] = geo_info
+        
+        for domain, domain_results in pending.items():
+            ip_address = domain_ips.get(domain)
+            geo_info = geo_by_ip.get(ip_address)
+            for result in domain_results:
+                result['ip_address'] = ip_address
+                if geo_info:
+                    result.update(geo_info)
+                    result['method'] = 'ip_geolocation'
+            if geo_info:
+                self._store_domain_country(domain, domain_results[0])
+        
+        return results
+    
+    def _resolve_domain_ips(self, domains: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve domain IPs concurrently on one event loop"""
+        async def gather() -> List[Optional[str]]:
+            semaphore = asyncio.Semaphore(GEO_BATCH_CONCURRENCY)
+            
+            async def bounded(domain: str) -> Optional[str]:
+                async with semaphore:
+                    return await self._a_get_domain_ip(domain)
+            
+            return await asyncio.gather(*(bounded(domain) for domain in domains))
+        
+        return dict(zip(domains, asyncio.run(gather())))
+    
+    def _batch_geolocate(self, ips: List[str], proxy: Optional[str] = None) -> Dict[str, Dict]:
+        """Geolocate IPs via the batch endpoint; IPs that fail are left out of the result"""
+        batch_url, field_map = GEOLOCATION_BATCH_API
+        proxies = self.proxy_manager.proxy_dict(proxy) if proxy else None
+        geo_by_ip = {}
+        
+        for i in range(0, len(ips), GEOLOCATION_BATCH_SIZE):
+            chunk = ips[i:i + GEOLOCATION_BATCH_SIZE]
             try:
-                logger.debug(f"Trying geolocation API: {api_url}")
-                
-                # Make request to geolocation API
-                response = requests.get(
-                    f"{api_url}{ip_address}" if not api_url.endswith('json/') else f"{api_url}",
+                response = self.session.post(
+                    batch_url,
+                    json=[{'query': ip_address} for ip_address in chunk],
                     proxies=proxies,
-                    timeout=self.timeout,
-                    headers={'User-Agent': 'Email-Validator/1.0'}
+                    timeout=self.timeout
                 )
+                self._report_proxy(proxy, True)
+                if response.status_code != 200:
+                    logger.debug("Batch geolocation returned HTTP %s", response.status_code)
+                    continue
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Parse response based on API format
-                    geo_info = self._parse_geolocation_response(data, api_url)
+                # Responses come back in request order
+                for ip_address, data in zip(chunk, _json_loads(response.content)):
+                    geo_info = self._parse_geolocation_response(data, field_map)
                     if geo_info:
-                        logger.debug(f"Geolocation successful: {geo_info}")
-                        return geo_info
+                        geo_by_ip[ip_address] = geo_info
+                        self._ip_geo_cache.set(ip_address, geo_info)
+                        self._cache_dirty = True
                 
             except Exception as e:
-                logger.debug(f"Geolocation API {api_url} failed: {e}")
-                continue
+                logger.debug("Batch geolocation failed for %s IPs: %s", len(chunk), e)
+                if isinstance(e, _PROXY_ERRORS):
+                    self._report_proxy(proxy, False)
+        
+        logger.debug("Batch geolocation resolved %s/%s IPs", len(geo_by_ip), len(ips))
+        return geo_by_ip
+    
+    async def _a_get_domain_ip(self, domain: str) -> Optional[str]:
+        """Async domain IP lookup through the shared DNS checker"""
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        
+        cached = self._domain_ip_cache.get(domain)
+        if cached is not None:
+            return cached or None
+        
+        try:
+            ips = (await self.dns_checker.a_check_a(domain))['ips']
+        except dns.exception.DNSException as e:
+            logger.debug("DNS A lookup failed for %s: %s", domain, e)
+            ips = []
+        
+        if ips:
+            self._domain_ip_cache.set(domain, ips[0])
+            return ips[0]
+        
+        # System resolver fallback is a blocking libc call, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._resolve_domain_ip, domain)
+    
+    def _get_domain_ip(self, domain: str) -> Optional[str]:
+        """Get IP address for a domain"""
+        # Remove www. prefix if present
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        
+        # Empty string marks a cached lookup failure
+        cached = self._domain_ip_cache.get(domain)
+        if cached is not None:
+            return cached or None
+        
+        return self._inflight.do(('domain', domain), lambda: self._resolve_domain_ip(domain), timeout=self.timeout)
+    
+    def _resolve_domain_ip(self, domain: str) -> Optional[str]:
+        """Resolve a domain's IP and cache the outcome"""
+        try:
+            try:
+                ips = self.dns_checker.check_a_record(domain)['ips']
+            except dns.exception.DNSException as e:
+                logger.debug("DNS A lookup failed for %s: %s", domain, e)
+                ips = []
+            # Fall back to the system resolver (hosts file, search domains) if DNS had no answer;
+            # getaddrinfo is reentrant on every platform, and AF_INET keeps it to A lookups
+            ip_address = ips[0] if ips else socket.getaddrinfo(
+                domain, None, socket.AF_INET, socket.SOCK_STREAM, 0, socket.AI_ADDRCONFIG
+            )[0][4][0]
+            logger.debug("IP address for %s: %s", domain, ip_address)
+            self._domain_ip_cache.set(domain, ip_address)
+            return ip_address
+        except (OSError, UnicodeError, IndexError) as e:
+            logger.debug("Failed to get IP for %s: %s", domain, e)
+            self._domain_ip_cache.set(domain, '', DNS_NEGATIVE_CACHE_TTL)
+            return None
+    
+    def _get_ip_geolocation(self, ip_address: str, proxy: Optional[str] = None) -> Optional[Dict]:
+        """Get geolocation information for an IP address"""
+        logger.debug("Getting geolocation for IP: %s", ip_address)
+        
+        # Skip private/local IPs
+        if self._is_private_ip(ip_address):
+            logger.debug("Skipping private IP: %s", ip_address)
+            return None
+        
+        geo_info = self._local_geolocation(ip_address)
+        if geo_info:
+            return geo_info
+        
+        cached = self._ip_geo_cache.get(ip_address)
+        if cached is not None:
+            logger.debug("Geolocation cache hit for %s", ip_address)
+            return dict(cached)
+        
+        geo_info = self._inflight.do(
+            ('geo', ip_address),
+            lambda: self._race_geolocation_apis(ip_address, proxy),
+            timeout=self.timeout
+        )
+        return dict(geo_info) if geo_info else None
+    
+    def _local_geolocation(self, ip_address: str) -> Optional[Dict]:
+        """Look up an IP in the offline GeoIP database, if one is configured"""
+        if self._mmdb is None:
+            return None
+        
+        try:
+            record = self._mmdb.get(ip_address)
+        except ValueError as e:
+            logger.debug("GeoIP lookup failed for %s: %s", ip_address, e)
+            return None
+        
+        country = (record or {}).get('country')
+        if not country:
+            return None
+        
+        return {
+            'country': country.get('names', {}).get('en', 'Unknown'),
+            'country_code': country.get('iso_code', 'XX'),
+            'region': 'Unknown',
+            'city': 'Unknown'
+        }
+    
+    def _race_geolocation_apis(self, ip_address: str, proxy: Optional[str]) -> Optional[Dict]:
+        """Query all geolocation APIs at once and cache the first successful answer"""
+        # Race all geolocation APIs; the first successful answer wins
+        futures = [
+            self._api_pool.submit(self._query_geolocation_api, api_url, field_map, ip_address, proxy)
+            for api_url, field_map in self._available_apis()
+        ]
+        try:
+            for future in as_completed(futures):
+                geo_info = future.result()
+                if geo_info:
+                    self._ip_geo_cache.set(ip_address, geo_info)
+                    self._cache_dirty = True
+                    return geo_info
+        finally:
+            # Requests already in flight finish in the background; queued ones are dropped
+            for future in futures:
+                future.cancel()
         
         return None
     
-    def _is_private_ip(self, ip: str) -> bool:
-        """Check if IP is private/local"""
+    async def _a_get_ip_geolocation(self, ip_address: str, proxy: Optional[str],
+                                    session: 'aiohttp.ClientSession') -> Optional[Dict]:
+        """Async counterpart of _get_ip_geolocation using the caller's aiohttp session"""
+        if self._is_private_ip(ip_address):
+            return None
+        
+        geo_info = self._local_geolocation(ip_address)
+        if geo_info:
+            return geo_info
+        
+        cached = self._ip_geo_cache.get(ip_address)
+        if cached is not None:
+            return dict(cached)
+        
+        # Concurrent lookups of the same IP on this loop share one race
+        loop = asyncio.get_running_loop()
+        key = (loop, ip_address)
+        task = self._a_inflight.get(key)
+        if task is None:
+            task = loop.create_task(self._a_race_geolocation_apis(ip_address, proxy, session))
+            self._a_inflight[key] = task
+            task.add_done_callback(lambda _: self._a_inflight.pop(key, None))
+        
+        geo_info = await asyncio.shield(task)
+        return dict(geo_info) if geo_info else None
+    
+    async def _a_race_geolocation_apis(self, ip_address: str, proxy: Optional[str],
+                                       session: 'aiohttp.ClientSession') -> Optional[Dict]:
+        """Query all geolocation APIs at once on the event loop; first successful answer wins"""
+        tasks = [
+            asyncio.ensure_future(self._a_query_geolocation_api(session, api_url, field_map, ip_address, proxy))
+            for api_url, field_map in self._available_apis()
+        ]
         try:
-            parts = ip.split('.')
-            if len(parts) != 4:
-                return True
-            
-            first = int(parts[0])
-            second = int(parts[1])
-            
-            # Private IP ranges
-            if first == 10:
-                return True
-            if first == 172 and 16 <= second <= 31:
-                return True
-            if first == 192 and second == 168:
-                return True
-            if first == 127:  # localhost
-                return True
-            
-            return False
-        except:
-            return True
+            for next_done in asyncio.as_completed(tasks):
+                geo_info = await next_done
+                if geo_info:
+                    self._ip_geo_cache.set(ip_address, geo_info)
+                    self._cache_dirty = True
+                    return geo_info
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return None
     
-    def _parse_geolocation_response(self, data: Dict, api_url: str) -> Optional[Dict]:
-        """Parse geolocation API response"""
+    async def _a_query_geolocation_api(self, session: 'aiohttp.ClientSession', api_url: str,
+                                       field_map: Dict[str, str], ip_address: str,
+                                       proxy: Optional[str]) -> Optional[Dict]:
+        """Query a single geolocation API over aiohttp; returns None on any failure"""
+        proxies = self.proxy_manager.proxy_dict(proxy) if proxy else None
         try:
-            if 'ip-api.com' in api_url:
-                if data.get('status') == 'success':
-                    return {
-                        'country': data.get('country', 'Unknown'),
-                        'country_code': data.get('countryCode', 'XX'),
-                        'region': data.get('regionName', 'Unknown'),
-                        'city': data.get('city', 'Unknown'),
-                        'timezone': data.get('timezone', 'Unknown')
-                    }
+            async with session.get(
+                api_url.format(ip=ip_address),
+                proxy=proxies['http'] if proxies else None
+            ) as response:
+                self._report_proxy(proxy, True)
+                self._record_api_result(api_url, response.status == 200)
+                if response.status == 200:
+                    return self._parse_geolocation_response(_json_loads(await response.read()), field_map)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.debug("Geolocation API %s failed: %s", api_url, e)
+            self._record_api_result(api_url, False)
+            if isinstance(e, (aiohttp.ClientProxyConnectionError, aiohttp.ClientHttpProxyError)):
+                self._report_proxy(proxy, False)
+        
+        return None
+    
+    def _query_geolocation_api(self, api_url: str, field_map: Dict[str, str], ip_address: str,
+                               proxy: Optional[str]) -> Optional[Dict]:
+        """Query a single geolocation API; returns None on any failure"""
+        try:
+            logger.debug("Trying geolocation API: %s", api_url)
             
-            elif 'ipapi.co' in api_url:
-                if 'error' not in data:
-                    return {
-                        'country': data.get('country_name', 'Unknown'),
-                        'country_code': data.get('country_code', 'XX'),
-                        'region': data.get('region', 'Unknown'),
-                        'city': data.get('city', 'Unknown'),
-                        'timezone': data.get('timezone', 'Unknown')
-                    }
+            # Make request to geolocation API
+            response = self.session.get(
+                api_url.format(ip=ip_address),
+                proxies=self.proxy_manager.proxy_dict(proxy) if proxy else None,
+                timeout=self.timeout
+            )
             
-            elif 'ipify.org' in api_url:
-                # This API only returns IP, not geolocation
-                return None
+            self._report_proxy(proxy, True)
+            self._record_api_result(api_url, response.status_code == 200)
+            if response.status_code == 200:
+                data = _json_loads(response.content)
+                
+                # Parse response using the API's field map
+                geo_info = self._parse_geolocation_response(data, field_map)
+                if geo_info:
+                    logger.debug("Geolocation successful: %s", geo_info)
+                    return geo_info
             
-            # Generic parsing for other APIs
-            return {
-                'country': data.get('country', data.get('country_name', 'Unknown')),
-                'country_code': data.get('country_code', data.get('countryCode', 'XX')),
-                'region': data.get('region', data.get('regionName', 'Unknown')),
-                'city': data.get('city', 'Unknown')
-            }
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            # Network/HTTP errors, malformed JSON and unexpected response shapes
+            logger.debug("Geolocation API %s failed: %s", api_url, e)
+            self._record_api_result(api_url, False)
+            if isinstance(e, _PROXY_ERRORS):
+                self._report_proxy(proxy, False)
+        
+        return None
+    
+    def _report_proxy(self, proxy: Optional[str], ok: bool):
+        """Feed the outcome of a proxied request back to the proxy manager"""
+        if not proxy:
+            return
+        if ok:
+            self.proxy_manager.mark_proxy_success(proxy)
+        elif proxy not in self.proxy_manager.failed_proxies:
+            # Racing APIs share the proxy; one failure is enough to start its backoff
+            self.proxy_manager.mark_proxy_failed(proxy)
+    
+    def _available_apis(self) -> List[Tuple[str, Mapping[str, str]]]:
+        """APIs not currently in a failure cooldown"""
+        now = time.monotonic()
+        return [api for api in self.apis if self._api_health[api[0]][1] <= now]
+    
+    def _record_api_result(self, api_url: str, ok: bool):
+        """Track consecutive API failures; too many puts the API in cooldown"""
+        with self._api_health_lock:
+            health = self._api_health[api_url]
+            if ok:
+                health[0] = 0
+                return
             
-        except Exception as e:
-            logger.debug(f"Failed to parse geolocation response: {e}")
+            health[0] += 1
+            if health[0] >= GEO_API_FAILURE_THRESHOLD:
+                health[0] = 0
+                health[1] = time.monotonic() + GEO_API_COOLDOWN
+                logger.warning(f"Geolocation API {api_url} failing, skipping it for {GEO_API_COOLDOWN}s")
+    
+    def _is_private_ip(self, ip: str) -> bool:
+        """Check if IP is private/local (anything not publicly routable, incl. CGNAT and link-local)"""
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return True
+        
+        return not address.is_global or address.is_multicast
+    
+    def _parse_geolocation_response(self, data: Dict, field_map: Dict[str, str]) -> Optional[Dict]:
+        """Parse geolocation API response"""
+        # Error responses (ip-api "fail", ipapi.co "error") carry no country field
+        if not data.get(field_map['country']):
             return None
+        
+        return {
+            key: data.get(field, 'XX' if key == 'country_code' else 'Unknown')
+            for key, field in field_map.items()
+        }
     
     def _get_domain_country(self, domain: str) -> Optional[Dict]:
         """Get country information from domain TLD and patterns - PRIORITY METHOD"""
-        logger.debug(f"Analyzing domain TLD for country: {domain}")
-        
-        domain_lower = domain.lower()
-        
-        # Country code TLDs - COMPREHENSIVE LIST
-        country_tlds = {
-            # Major countries
-            '.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-            '.us': {'country': 'United States', 'country_code': 'US'},
-            '.ca': {'country': 'Canada', 'country_code': 'CA'},
-            '.au': {'country': 'Australia', 'country_code': 'AU'},
-            '.de': {'country': 'Germany', 'country_code': 'DE'},
-            '.fr': {'country': 'France', 'country_code': 'FR'},
-            '.jp': {'country': 'Japan', 'country_code': 'JP'},
-            '.cn': {'country': 'China', 'country_code': 'CN'},
-            '.ru': {'country': 'Russia', 'country_code': 'RU'},
-            '.in': {'country': 'India', 'country_code': 'IN'},
-            '.br': {'country': 'Brazil', 'country_code': 'BR'},
-            '.it': {'country': 'Italy', 'country_code': 'IT'},
-            '.es': {'country': 'Spain', 'country_code': 'ES'},
-            '.nl': {'country': 'Netherlands', 'country_code': 'NL'},
-            '.mx': {'country': 'Mexico', 'country_code': 'MX'},
-            '.kr': {'country': 'South Korea', 'country_code': 'KR'},
-            '.hn': {'country': 'Honduras', 'country_code': 'HN'},
-            '.pk': {'country': 'Pakistan', 'country_code': 'PK'},
-            '.bd': {'country': 'Bangladesh', 'country_code': 'BD'},
-            '.ar': {'country': 'Argentina', 'country_code': 'AR'},
-            '.cl': {'country': 'Chile', 'country_code': 'CL'},
-            '.co': {'country': 'Colombia', 'country_code': 'CO'},
-            '.pe': {'country': 'Peru', 'country_code': 'PE'},
-            '.ve': {'country': 'Venezuela', 'country_code': 'VE'},
-            '.th': {'country': 'Thailand', 'country_code': 'TH'},
-            '.sg': {'country': 'Singapore', 'country_code': 'SG'},
-            '.my': {'country': 'Malaysia', 'country_code': 'MY'},
-            '.id': {'country': 'Indonesia', 'country_code': 'ID'},
-            '.ph': {'country': 'Philippines', 'country_code': 'PH'},
-            '.vn': {'country': 'Vietnam', 'country_code': 'VN'},
-            '.tw': {'country': 'Taiwan', 'country_code': 'TW'},
-            '.hk': {'country': 'Hong Kong', 'country_code': 'HK'},
-            '.nz': {'country': 'New Zealand', 'country_code': 'NZ'},
-            '.za': {'country': 'South Africa', 'country_code': 'ZA'},
-            '.eg': {'country': 'Egypt', 'country_code': 'EG'},
-            '.ng': {'country': 'Nigeria', 'country_code': 'NG'},
-            '.ke': {'country': 'Kenya', 'country_code': 'KE'},
-            '.se': {'country': 'Sweden', 'country_code': 'SE'},
-            '.no': {'country': 'Norway', 'country_code': 'NO'},
-            '.dk': {'country': 'Denmark', 'country_code': 'DK'},
-            '.fi': {'country': 'Finland', 'country_code': 'FI'},
-            '.pl': {'country': 'Poland', 'country_code': 'PL'},
-            '.ch': {'country': 'Switzerland', 'country_code': 'CH'},
-            '.at': {'country': 'Austria', 'country_code': 'AT'},
-            '.be': {'country': 'Belgium', 'country_code': 'BE'},
-            '.pt': {'country': 'Portugal', 'country_code': 'PT'},
-            '.gr': {'country': 'Greece', 'country_code': 'GR'},
-            '.cz': {'country': 'Czech Republic', 'country_code': 'CZ'},
-            '.hu': {'country': 'Hungary', 'country_code': 'HU'},
-            '.ro': {'country': 'Romania', 'country_code': 'RO'},
-            '.bg': {'country': 'Bulgaria', 'country_code': 'BG'},
-            '.hr': {'country': 'Croatia', 'country_code': 'HR'},
-            '.sk': {'country': 'Slovakia', 'country_code': 'SK'},
-            '.si': {'country': 'Slovenia', 'country_code': 'SI'},
-            '.ee': {'country': 'Estonia', 'country_code': 'EE'},
-            '.lv': {'country': 'Latvia', 'country_code': 'LV'},
-            '.lt': {'country': 'Lithuania', 'country_code': 'LT'},
-            '.ie': {'country': 'Ireland', 'country_code': 'IE'},
-            '.is': {'country': 'Iceland', 'country_code': 'IS'},
-            '.tr': {'country': 'Turkey', 'country_code': 'TR'},
-            '.il': {'country': 'Israel', 'country_code': 'IL'},
-            '.sa': {'country': 'Saudi Arabia', 'country_code': 'SA'},
-            '.ae': {'country': 'United Arab Emirates', 'country_code': 'AE'},
-            '.ir': {'country': 'Iran', 'country_code': 'IR'},
-            '.iq': {'country': 'Iraq', 'country_code': 'IQ'},
-            '.jo': {'country': 'Jordan', 'country_code': 'JO'},
-            '.lb': {'country': 'Lebanon', 'country_code': 'LB'},
-            '.sy': {'country': 'Syria', 'country_code': 'SY'},
-            '.kw': {'country': 'Kuwait', 'country_code': 'KW'},
-            '.qa': {'country': 'Qatar', 'country_code': 'QA'},
-            '.bh': {'country': 'Bahrain', 'country_code': 'BH'},
-            '.om': {'country': 'Oman', 'country_code': 'OM'},
-            '.ye': {'country': 'Yemen', 'country_code': 'YE'}
-        }
+        logger.debug("Analyzing domain TLD for country: %s", domain)
         
-        # Check for single-level country TLDs
-        for tld, info in country_tlds.items():
-            if domain_lower.endswith(tld):
-                logger.debug(f"TLD match found: {domain_lower} -> {info['country']}")
-                return {
-                    'country': info['country'],
-                    'country_code': info['country_code'],
-                    'region': 'Unknown',
-                    'city': 'Unknown'
-                }
-        
-        # Check for multi-level country domains (IMPORTANT for your examples)
-        multi_level_domains = {
-            '.co.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-            '.co.jp': {'country': 'Japan', 'country_code': 'JP'},
-            '.co.kr': {'country': 'South Korea', 'country_code': 'KR'},
-            '.co.in': {'country': 'India', 'country_code': 'IN'},
-            '.co.za': {'country': 'South Africa', 'country_code': 'ZA'},
-            '.com.au': {'country': 'Australia', 'country_code': 'AU'},
-            '.com.br': {'country': 'Brazil', 'country_code': 'BR'},
-            '.com.mx': {'country': 'Mexico', 'country_code': 'MX'},
-            '.com.ar': {'country': 'Argentina', 'country_code': 'AR'},
-            '.com.cn': {'country': 'China', 'country_code': 'CN'},
-            '.com.tw': {'country': 'Taiwan', 'country_code': 'TW'},
-            '.com.hk': {'country': 'Hong Kong', 'country_code': 'HK'},
-            '.com.sg': {'country': 'Singapore', 'country_code': 'SG'},
-            '.com.my': {'country': 'Malaysia', 'country_code': 'MY'},
-            '.com.ph': {'country': 'Philippines', 'country_code': 'PH'},
-            '.com.th': {'country': 'Thailand', 'country_code': 'TH'},
-            '.com.vn': {'country': 'Vietnam', 'country_code': 'VN'},
-            '.com.pk': {'country': 'Pakistan', 'country_code': 'PK'},
-            '.com.bd': {'country': 'Bangladesh', 'country_code': 'BD'},
-            '.gov.mx': {'country': 'Mexico', 'country_code': 'MX'},
-            '.gob.mx': {'country': 'Mexico', 'country_code': 'MX'},
-            '.sch.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-            '.ac.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-            '.gov.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-            '.ne.jp': {'country': 'Japan', 'country_code': 'JP'},
-            '.or.jp': {'country': 'Japan', 'country_code': 'JP'},
-            '.ac.jp': {'country': 'Japan', 'country_code': 'JP'},
-            '.go.jp': {'country': 'Japan', 'country_code': 'JP'},
-            '.ed.jp': {'country': 'Japan', 'country_code': 'JP'}
-        }
+        # Two hash lookups on the trailing labels instead of an endswith() scan over every TLD
+        labels = domain.rsplit('.', 2)
+        info = None
+        if len(labels) >= 3:
+            info = _MULTI_LEVEL_TLDS.get((labels[-2], labels[-1]))
+        if info is None and len(labels) >= 2:
+            info = _COUNTRY_TLDS.get(labels[-1])
         
-        for multi_tld, info in multi_level_domains.items():
-            if domain_lower.endswith(multi_tld):
-                logger.debug(f"Multi-level TLD match: {domain_lower} -> {info['country']}")
-                return {
-                    'country': info['country'],
-                    'country_code': info['country_code'],
-                    'region': 'Unknown',
-                    'city': 'Unknown'
-                }
-        
-        logger.debug(f"No TLD match found for: {domain_lower}")
-        return None
-    
-    def _get_provider_country(self, domain: str) -> Optional[Dict]:
-        """Get country information based on known email providers"""
-        logger.debug(f"Checking provider country for domain: {domain}")
-        
-        # Known email providers and their primary countries
-        provider_countries = {
-            'gmail.com': {'country': 'United States', 'country_code': 'US'},
-            'yahoo.com': {'country': 'United States', 'country_code': 'US'},
-            'yahoo.co.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-            'yahoo.co.jp': {'country': 'Japan', 'country_code': 'JP'},
-            'yahoo.de': {'country': 'Germany', 'country_code': 'DE'},
-            'yahoo.fr': {'country': 'France', 'country_code': 'FR'},
-            'yahoo.ca': {'country': 'Canada', 'country_code': 'CA'},
-            'yahoo.com.au': {'country': 'Australia', 'country_code': 'AU'},
-            'hotmail.com': {'country': 'United States', 'country_code': 'US'},
-            'hotmail.co.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-            'hotmail.de': {'country': 'Germany', 'country_code': 'DE'},
-            'hotmail.fr': {'country': 'France', 'country_code': 'FR'},
-            'outlook.com': {'country': 'United States', 'country_code': 'US'},
-            'live.com': {'country': 'United States', 'country_code': 'US'},
-            'live.co.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-            'aol.com': {'country': 'United States', 'country_code': 'US'},
-            'aol.co.uk': {'country': 'United Kingdom', 'country_code': 'GB'},
-        }
-        
-        domain_lower = domain.lower()
-        if domain_lower in provider_countries:
-            info = provider_countries[domain_lower]
-            logger.debug(f"Provider match: {domain_lower} -> {info['country']}")
-            return {
-                'country': info['country'],
-                'country_code': info['country_code'],
-                'region': 'Unknown',
-                'city': 'Unknown'
-            }
+        if info:
+            logger.debug("TLD match found: %s -> %s", domain, info[0])
+            return _country_result(info)
         
+        logger.debug("No TLD match found for: %s", domain)
         return None
     
     def get_country_statistics(self, results: List[Dict]) -> Dict:
@@ -378,41 +958,49 @@ class GeoLocator:
             'unknown_count': 0
         }
         
-        # Count emails by country
-        for result in results:
-            country = result.get('country', 'Unknown')
+        # One pass counting (country, status bucket) pairs
+        if len(results) > _STATS_PANDAS_THRESHOLD:
+            pairs = self._count_country_statuses_pandas(results)
+        else:
+            pairs = Counter(map(_country_status_pair, results))
+        
+        countries_found = stats['countries_found']
+        totals = Counter()
+        for (country, bucket), count in pairs.items():
             if country == 'Unknown':
-                stats['unknown_count'] += 1
-            else:
-                if country not in stats['countries_found']:
-                    stats['countries_found'][country] = {
-                        'total': 0,
-                        'valid': 0,
-                        'invalid': 0,
-                        'skipped': 0
-                    }
-                
-                stats['countries_found'][country]['total'] += 1
-                
-                status = result.get('status', 'INVALID')
-                if status == 'VALID':
-                    stats['countries_found'][country]['valid'] += 1
-                elif status == 'INVALID':
-                    stats['countries_found'][country]['invalid'] += 1
-                else:
-                    stats['countries_found'][country]['skipped'] += 1
+                stats['unknown_count'] += count
+                continue
+            
+            data = countries_found.get(country)
+            if data is None:
+                data = countries_found[country] = {'total': 0, 'valid': 0, 'invalid': 0, 'skipped': 0}
+            data[bucket] += count
+            data['total'] += count
+            totals[country] += count
         
         # Create summary sorted by total count
-        for country, data in sorted(stats['countries_found'].items(), 
-                                   key=lambda x: x[1]['total'], reverse=True):
+        for country, total in sorted(totals.items(), key=itemgetter(1), reverse=True):
+            data = stats['countries_found'][country]
             stats['country_summary'].append({
                 'country': country,
-                'total': data['total'],
+                'total': total,
                 'valid': data['valid'],
                 'invalid': data['invalid'],
                 'skipped': data['skipped'],
-                'percentage': (data['total'] / stats['total_emails']) * 100
+                'percentage': total * 100.0 / stats['total_emails']
             })
         
         logger.info(f"Country statistics: {len(stats['countries_found'])} countries found")
-        return stats
\ No newline at end of file
+        return stats
+    
+    def _count_country_statuses_pandas(self, results: List[Dict]) -> Dict[Tuple[str, str], int]:
+        """Count (country, status bucket) pairs with a pandas group-by for large result lists"""
+        # Imported here so small runs never pay pandas' import cost
+        import pandas as pd
+        
+        df = pd.DataFrame.from_records(results, columns=['country', 'status'])
+        df = df.fillna({'country': 'Unknown', 'status': 'INVALID'})
+        buckets = df['status'].map(_STATUS_BUCKETS).fillna('skipped')
+        # sort=False keeps first-seen order, matching the Counter path
+        counts = df.groupby([df['country'], buckets], sort=False).size()
+        return {pair: int(count) for pair, count in counts.items()}
@@ -1,277 +1,477 @@
+import heapq
+import logging
 import random
+import re
+import threading
 import time
+from collections import deque
 import requests
-from typing import List, Optional, Dict
-from config import PROXY_ROTATION_COUNT, PROXY_TIMEOUT, MAX_PROXY_RETRIES
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Dict, Tuple
+from config import (
+    PROXY_ROTATION_COUNT, PROXY_TIMEOUT, MAX_PROXY_RETRIES, PROXY_TEST_CONCURRENCY, PROXY_SELECTION_STRATEGY,
+    PROXY_RETRY_BACKOFF, PROXY_RETRY_BACKOFF_MAX, PROXY_TEST_RETRIES, PROXY_TEST_RETRY_BACKOFF,
+    PROXY_HEALTH_CHECK_INTERVAL
+)
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# username:password@ip:port, or plain ip:port
+_PROXY_RE = re.compile(r'^(?:([^:@]+):([^@]+)@)?([^:@]+):(\d+)$')
+
 class ProxyManager:
     def __init__(self, proxy_list: List[str] = None):
-        self.proxy_list = proxy_list or []
-        self.current_proxy_index = 0
+        # Insertion-ordered set of all proxies: O(1) membership, add and remove
+        self._proxies: Dict[str, None] = dict.fromkeys(proxy_list or [])
+        # Healthy proxies in rotation order; the head is the current proxy
+        self._healthy = deque(self._proxies)
         self.usage_count = 0
         self.rotation_count = PROXY_ROTATION_COUNT
         self.timeout = PROXY_TIMEOUT
         self.max_retries = MAX_PROXY_RETRIES
+        self.strategy = PROXY_SELECTION_STRATEGY
+        # Own generator for random selection and shuffling, independent of the module-level one
+        self._rng = random.Random()
+        # Selection strategy name -> picker used by get_working_proxy
+        self._selectors = {
+            'round_robin': self._next_round_robin,
+            'random': self.get_random_proxy,
+            'best': self.get_best_proxy,
+            'weighted': self._next_weighted
+        }
+        # Interleaved weighted round-robin order, rebuilt from success rates once consumed
+        self._schedule: List[str] = []
+        self._schedule_pos = 0
         self.failed_proxies = set()
         self.proxy_stats = {}
+        # Failed proxy -> time.monotonic_ns() when it may be retried, plus a heap to find due ones
+        self._retry_at: Dict[str, int] = {}
+        self._retry_heap: List[Tuple[int, str]] = []
+        # Background health check timer and its latest (proxies, results), applied on the next selection
+        self._health_timer: Optional[threading.Timer] = None
+        self._pending_health: Optional[Tuple[List[str], List[bool]]] = None
+        # Guards selection and pass/fail bookkeeping, which the health timer and geolocation threads also reach
+        self._lock = threading.RLock()
+        # Proxy -> time.monotonic_ns() of its last use, kept flat so the per-request write is one store
+        self._last_used: Dict[str, int] = {}
+        
+        # Shared keep-alive session for proxy checks; one quick retry so a blip doesn't fail a proxy
+        self.session = requests.Session()
+        retry = Retry(
+            total=PROXY_TEST_RETRIES,
+            backoff_factor=PROXY_TEST_RETRY_BACKOFF,
+            status_forcelist=(429, 502, 503, 504)
+        )
+        adapter = HTTPAdapter(
+            pool_connections=PROXY_TEST_CONCURRENCY,
+            pool_maxsize=PROXY_TEST_CONCURRENCY,
+            max_retries=retry
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': 'Email-Validator/1.0'})
+        
+        # requests-style proxy dicts, parsed once per proxy (None if malformed)
+        self._proxy_dicts: Dict[str, Optional[Mapping[str, str]]] = {}
         
         # Initialize proxy statistics
-        for proxy in self.proxy_list:
+        for proxy in self._proxies:
+            self._proxy_dicts[proxy] = self._build_proxy_dict(proxy)
             self.proxy_stats[proxy] = {
                 'total_requests': 0,
                 'successful_requests': 0,
                 'failed_requests': 0,
-                'last_used': None,
+                'failed_health_checks': 0,
                 'is_working': True
             }
         
-        logger.info(f"Proxy manager initialized with {len(self.proxy_list)} proxies")
+        logger.info(f"Proxy manager initialized with {len(self._proxies)} proxies")
     
     def get_working_proxy(self) -> Optional[str]:
         """Get a working proxy with automatic rotation"""
-        if not self.proxy_list:
-            logger.debug("No proxies available, returning None")
+        if not self._proxies:
+            # Runs for every lookup when no proxies are configured, so skip even the log record
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("No proxies available, returning None")
             return None
         
+        with self._lock:
+            if self._pending_health is not None:
+                pending, self._pending_health = self._pending_health, None
+                self._apply_health(*pending)
+            
+            if self._retry_heap:
+                self._readmit_due_proxies()
+            
+            current_proxy = self._selectors.get(self.strategy, self._next_round_robin)()
+            
+            if current_proxy:
+                self.usage_count += 1
+                self.proxy_stats[current_proxy]['total_requests'] += 1
+                self._last_used[current_proxy] = time.monotonic_ns()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Using proxy: %s (usage: %s/%s)", current_proxy, self.usage_count, self.rotation_count)
+        
+        return current_proxy
+    
+    def _next_round_robin(self) -> Optional[str]:
+        """Current proxy, rotating after rotation_count uses"""
         # Check if we need to rotate proxy
         if self.usage_count >= self.rotation_count:
             self.rotate_proxy()
         
-        # Get current proxy
-        current_proxy = self._get_current_proxy()
+        return self._get_current_proxy()
+    
+    def _next_weighted(self) -> Optional[str]:
+        """Next proxy from the weighted schedule, skipping proxies that failed since it was built"""
+        for _ in range(2):
+            while self._schedule_pos < len(self._schedule):
+                proxy = self._schedule[self._schedule_pos]
+                self._schedule_pos += 1
+                if proxy not in self.failed_proxies and proxy in self.proxy_stats:
+                    return proxy
+            
+            self._schedule = self._build_weighted_schedule()
+            self._schedule_pos = 0
+            if not self._schedule:
+                # Nothing healthy; fall back to round-robin's reset of failed proxies
+                return self._get_current_proxy()
         
-        if current_proxy:
-            self.usage_count += 1
-            self.proxy_stats[current_proxy]['total_requests'] += 1
-            self.proxy_stats[current_proxy]['last_used'] = time.time()
-            logger.debug(f"Using proxy: {current_proxy} (usage: {self.usage_count}/{self.rotation_count})")
+        return None
+    
+    def _build_weighted_schedule(self) -> List[str]:
+        """Interleave healthy proxies by weight, e.g. A=4, B=3, C=2 -> ABCABCABA"""
+        weights = []
+        for proxy in self._healthy:
+            stats = self.proxy_stats[proxy]
+            if stats['total_requests'] == 0:
+                weight = 10  # New proxy, give it a chance
+            else:
+                weight = max(1, stats['successful_requests'] * 10 // stats['total_requests'])
+            weights.append((proxy, weight))
         
-        return current_proxy
+        max_weight = max((weight for _, weight in weights), default=0)
+        return [proxy for round_ in range(max_weight) for proxy, weight in weights if weight > round_]
     
     def _get_current_proxy(self) -> Optional[str]:
         """Get current proxy, skipping failed ones"""
-        if not self.proxy_list:
-            return None
-        
-        attempts = 0
-        while attempts < len(self.proxy_list):
-            current_proxy = self.proxy_list[self.current_proxy_index]
-            
-            # Check if proxy is marked as failed
-            if current_proxy not in self.failed_proxies:
-                if self.proxy_stats[current_proxy]['is_working']:
-                    return current_proxy
-            
-            # Move to next proxy
-            self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxy_list)
-            attempts += 1
+        try:
+            return self._healthy[0]
+        except IndexError:
+            pass
         
-        # If all proxies failed, reset failed proxies and try again
+        # If all proxies failed, bring back only the one due soonest rather than all of them
         if self.failed_proxies:
-            logger.warning("All proxies failed, resetting failed proxy list")
-            self.failed_proxies.clear()
-            for proxy in self.proxy_stats:
-                self.proxy_stats[proxy]['is_working'] = True
-            return self.proxy_list[self.current_proxy_index]
+            proxy = min(self.failed_proxies, key=lambda p: self._retry_at.get(p, 0))
+            logger.warning("All proxies failed, retrying %s early", proxy)
+            self._readmit(proxy)
+            return proxy
         
         return None
     
+    def _readmit(self, proxy: str):
+        """Return a failed proxy to rotation"""
+        self.failed_proxies.discard(proxy)
+        self._retry_at.pop(proxy, None)
+        self.proxy_stats[proxy]['is_working'] = True
+        if proxy not in self._healthy:
+            self._healthy.append(proxy)
+    
+    def _readmit_due_proxies(self):
+        """Readmit failed proxies whose backoff has expired"""
+        now = time.monotonic_ns()
+        while self._retry_heap and self._retry_heap[0][0] <= now:
+            retry_at, proxy = heapq.heappop(self._retry_heap)
+            # Skip entries superseded by a later failure, removal or early readmission
+            if self._retry_at.get(proxy) == retry_at:
+                logger.debug("Proxy backoff expired, retrying: %s", proxy)
+                self._readmit(proxy)
+    
+    @property
+    def proxy_list(self) -> List[str]:
+        """All proxies in order, healthy or not"""
+        return list(self._proxies)
+    
+    @property
+    def current_proxy_index(self) -> int:
+        """Position of the current proxy in proxy_list"""
+        try:
+            return self.proxy_list.index(self._healthy[0])
+        except (IndexError, ValueError):
+            return 0
+    
     def rotate_proxy(self):
         """Rotate to next proxy"""
-        if not self.proxy_list:
+        if not self._healthy:
             return
         
-        old_index = self.current_proxy_index
-        self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxy_list)
+        old_proxy = self._healthy[0]
+        self._healthy.rotate(-1)
         self.usage_count = 0
         
-        logger.debug(f"Proxy rotated: {old_index} -> {self.current_proxy_index}")
+        logger.debug("Proxy rotated: %s -> %s", old_proxy, self._healthy[0])
     
     def mark_proxy_failed(self, proxy: str):
         """Mark a proxy as failed"""
-        if proxy in self.proxy_list:
-            self.failed_proxies.add(proxy)
-            self.proxy_stats[proxy]['is_working'] = False
-            self.proxy_stats[proxy]['failed_requests'] += 1
-            logger.warning(f"Proxy marked as failed: {proxy}")
-            
-            # Rotate to next proxy if current one failed
-            if proxy == self.proxy_list[self.current_proxy_index]:
-                self.rotate_proxy()
+        with self._lock:
+            if proxy in self.proxy_stats:
+                self.proxy_stats[proxy]['failed_requests'] += 1
+                self._suspend(proxy, self.proxy_stats[proxy]['failed_requests'])
+    
+    def _suspend(self, proxy: str, failures: int):
+        """Take a proxy out of rotation until its backoff for `failures` failures expires"""
+        self.failed_proxies.add(proxy)
+        self.proxy_stats[proxy]['is_working'] = False
+        
+        # Exponential backoff on consecutive failures before the proxy is tried again
+        backoff = min(PROXY_RETRY_BACKOFF * 2 ** (failures - 1), PROXY_RETRY_BACKOFF_MAX)
+        retry_at = time.monotonic_ns() + int(backoff * 1e9)
+        self._retry_at[proxy] = retry_at
+        heapq.heappush(self._retry_heap, (retry_at, proxy))
+        logger.warning("Proxy marked as failed: %s (retry in %.0fs)", proxy, backoff)
+        
+        # Dropping the current proxy moves rotation on to the next one
+        was_current = bool(self._healthy) and self._healthy[0] == proxy
+        try:
+            self._healthy.remove(proxy)
+        except ValueError:
+            pass
+        if was_current:
+            self.usage_count = 0
     
     def mark_proxy_success(self, proxy: str):
         """Mark a proxy as successful"""
-        if proxy in self.proxy_list:
-            self.proxy_stats[proxy]['successful_requests'] += 1
-            logger.debug(f"Proxy marked as successful: {proxy}")
+        with self._lock:
+            if proxy in self.proxy_stats:
+                self.proxy_stats[proxy]['successful_requests'] += 1
+                logger.debug("Proxy marked as successful: %s", proxy)
     
     def test_proxy(self, proxy: str) -> bool:
         """Test if a proxy is working"""
-        logger.debug(f"Testing proxy: {proxy}")
+        logger.debug("Testing proxy: %s", proxy)
         
         try:
-            # Parse proxy format: username:password@ip:port
-            if '@' in proxy:
-                auth_part, server_part = proxy.split('@')
-                username, password = auth_part.split(':')
-                ip, port = server_part.split(':')
-                
-                proxy_dict = {
-                    'http': f'http://{username}:{password}@{ip}:{port}',
-                    'https': f'http://{username}:{password}@{ip}:{port}'
-                }
-            else:
-                # Simple ip:port format
-                proxy_dict = {
-                    'http': f'http://{proxy}',
-                    'https': f'http://{proxy}'
-                }
+            proxy_dict = self._proxy_dicts.get(proxy) or self._build_proxy_dict(proxy)
+            if proxy_dict is None:
+                logger.debug("Proxy test failed: %s - invalid proxy format", proxy)
+                return False
             
             # Test proxy with a simple request
-            response = requests.get(
+            response = self.session.get(
                 'http://httpbin.org/ip',
                 proxies=proxy_dict,
-                timeout=self.timeout,
-                headers={'User-Agent': 'Email-Validator/1.0'}
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                logger.debug(f"Proxy test successful: {proxy}")
+                logger.debug("Proxy test successful: %s", proxy)
                 return True
             else:
-                logger.debug(f"Proxy test failed with status {response.status_code}: {proxy}")
+                logger.debug("Proxy test failed with status %s: %s", response.status_code, proxy)
                 return False
                 
         except Exception as e:
-            logger.debug(f"Proxy test failed: {proxy} - {e}")
+            logger.debug("Proxy test failed: %s - %s", proxy, e)
             return False
     
     def test_all_proxies(self) -> List[str]:
         """Test all proxies and return working ones"""
         logger.info("Testing all proxies")
+        proxies = self.proxy_list
+        return self._apply_health(proxies, self._check_proxies(proxies))
+    
+    def _check_proxies(self, proxies: List[str]) -> List[bool]:
+        """Run test_proxy on every proxy concurrently; touches no proxy state"""
+        # Checks are network-bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=max(1, min(PROXY_TEST_CONCURRENCY, len(proxies)))) as executor:
+            return list(executor.map(self.test_proxy, proxies))
+    
+    def _apply_health(self, proxies: List[str], results: List[bool]) -> List[str]:
+        """Readmit proxies that passed a check and suspend the rest; returns the working ones"""
         working_proxies = []
+        with self._lock:
+            for proxy, is_working in zip(proxies, results):
+                if proxy not in self._proxies:
+                    continue  # removed while the check was running
+                if is_working:
+                    working_proxies.append(proxy)
+                    self._readmit(proxy)
+                else:
+                    # Probe failures are tracked apart from request failures, and a proxy
+                    # already backing off keeps its current backoff
+                    self.proxy_stats[proxy]['failed_health_checks'] += 1
+                    if proxy not in self.failed_proxies:
+                        self._suspend(proxy, 1)
         
-        for proxy in self.proxy_list:
-            if self.test_proxy(proxy):
-                working_proxies.append(proxy)
-                self.proxy_stats[proxy]['is_working'] = True
-            else:
-                self.mark_proxy_failed(proxy)
-        
-        logger.info(f"Proxy test completed: {len(working_proxies)}/{len(self.proxy_list)} working")
+        logger.info(f"Proxy test completed: {len(working_proxies)}/{len(proxies)} working")
         return working_proxies
     
-    def get_proxy_for_request(self, url: str) -> Optional[Dict]:
+    def periodic_health_check(self, interval: float = PROXY_HEALTH_CHECK_INTERVAL):
+        """Re-test all proxies every interval seconds on a background timer"""
+        if interval <= 0 or self._health_timer is not None:
+            return
+        
+        def run():
+            # Only the network checks happen off-thread; results are applied by get_working_proxy
+            proxies = self.proxy_list
+            results = self._check_proxies(proxies)
+            with self._lock:
+                self._pending_health = (proxies, results)
+            if self._health_timer is not None:
+                schedule()
+        
+        def schedule():
+            self._health_timer = threading.Timer(interval, run)
+            self._health_timer.daemon = True
+            self._health_timer.start()
+        
+        schedule()
+        logger.info(f"Proxy health checks scheduled every {interval}s")
+    
+    def get_proxy_for_request(self, url: str) -> Optional[Mapping[str, str]]:
         """Get proxy configuration for requests library"""
         proxy = self.get_working_proxy()
         
         if not proxy:
             return None
         
-        try:
-            # Parse proxy format: username:password@ip:port
-            if '@' in proxy:
-                auth_part, server_part = proxy.split('@')
-                username, password = auth_part.split(':')
-                ip, port = server_part.split(':')
-                
-                proxy_url = f'http://{username}:{password}@{ip}:{port}'
-            else:
-                # Simple ip:port format
-                proxy_url = f'http://{proxy}'
-            
-            return {
-                'http': proxy_url,
-                'https': proxy_url
-            }
-            
-        except Exception as e:
-            logger.error(f"Error parsing proxy {proxy}: {e}")
+        proxy_dict = self.proxy_dict(proxy)
+        if proxy_dict is None:
+            logger.error(f"Error parsing proxy {proxy}: invalid proxy format")
             self.mark_proxy_failed(proxy)
+        
+        return proxy_dict
+    
+    def proxy_dict(self, proxy: str) -> Optional[Mapping[str, str]]:
+        """Read-only requests proxies mapping for a proxy string, parsed once; None if malformed"""
+        try:
+            return self._proxy_dicts[proxy]
+        except KeyError:
+            # Proxies handed in from outside the managed list are parsed the same way
+            return self._proxy_dicts.setdefault(proxy, self._build_proxy_dict(proxy))
+    
+    def _build_proxy_dict(self, proxy: str) -> Optional[Mapping[str, str]]:
+        """Parse username:password@ip:port or ip:port into a requests proxies dict"""
+        match = _PROXY_RE.match(proxy)
+        if not match:
             return None
+        
+        username, password, ip, port = match.groups()
+        auth = f'{username}:{password}@' if username else ''
+        proxy_url = f'http://{auth}{ip}:{port}'
+        # Both schemes share the one URL string; read-only since the same mapping is handed to every caller
+        return MappingProxyType({
+            'http': proxy_url,
+            'https': proxy_url
+        })
+    
+    def close(self):
+        """Stop background health checks and close pooled connections used for proxy checks"""
+        timer, self._health_timer = self._health_timer, None
+        if timer is not None:
+            timer.cancel()
+        self.session.close()
     
     def reset_usage_count(self):
         """Reset usage count for current proxy"""
         self.usage_count = 0
         logger.debug("Proxy usage count reset")
     
+    def _success_rate(self, proxy_stats: Dict, default: float) -> float:
+        """Percentage of a proxy's requests that succeeded, or default if it has none"""
+        if proxy_stats['total_requests'] == 0:
+            return default
+        return (proxy_stats['successful_requests'] / proxy_stats['total_requests']) * 100
+    
+    def _wall_clock(self, monotonic_ns: Optional[int], now: float, now_ns: int) -> Optional[float]:
+        """Convert a monotonic_ns stamp into a time.time() timestamp for reporting"""
+        if monotonic_ns is None:
+            return None
+        return now - (now_ns - monotonic_ns) / 1e9
+    
     def get_proxy_stats(self) -> Dict:
         """Get statistics about proxy usage"""
-        if not self.proxy_list:
+        if not self._proxies:
             return {'total_proxies': 0, 'working_proxies': 0, 'failed_proxies': 0}
         
-        working_count = sum(1 for stats in self.proxy_stats.values() if stats['is_working'])
-        failed_count = len(self.failed_proxies)
-        
-        stats = {
-            'total_proxies': len(self.proxy_list),
-            'working_proxies': working_count,
-            'failed_proxies': failed_count,
-            'current_proxy_index': self.current_proxy_index,
-            'current_usage_count': self.usage_count,
-            'rotation_threshold': self.rotation_count,
-            'proxy_details': []
-        }
+        now, now_ns = time.time(), time.monotonic_ns()
         
-        # Add detailed stats for each proxy
-        for proxy, proxy_stats in self.proxy_stats.items():
-            success_rate = 0
-            if proxy_stats['total_requests'] > 0:
-                success_rate = (proxy_stats['successful_requests'] / proxy_stats['total_requests']) * 100
-            
-            stats['proxy_details'].append({
+        # One pass over the proxies builds the details and counts working ones
+        proxy_details = [
+            {
                 'proxy': proxy,
                 'is_working': proxy_stats['is_working'],
                 'total_requests': proxy_stats['total_requests'],
                 'successful_requests': proxy_stats['successful_requests'],
                 'failed_requests': proxy_stats['failed_requests'],
-                'success_rate': success_rate,
-                'last_used': proxy_stats['last_used']
-            })
+                'failed_health_checks': proxy_stats['failed_health_checks'],
+                'success_rate': self._success_rate(proxy_stats, default=0),
+                'last_used': self._wall_clock(self._last_used.get(proxy), now, now_ns)
+            }
+            for proxy, proxy_stats in self.proxy_stats.items()
+        ]
+        
+        stats = {
+            'total_proxies': len(self._proxies),
+            'working_proxies': sum(detail['is_working'] for detail in proxy_details),
+            'failed_proxies': len(self.failed_proxies),
+            'current_proxy_index': self.current_proxy_index,
+            'current_usage_count': self.usage_count,
+            'rotation_threshold': self.rotation_count,
+            'proxy_details': proxy_details
+        }
         
         return stats
     
     def shuffle_proxies(self):
         """Shuffle proxy list for random selection"""
-        if self.proxy_list:
-            random.shuffle(self.proxy_list)
-            self.current_proxy_index = 0
+        if self._proxies:
+            order = list(self._proxies)
+            self._rng.shuffle(order)
+            self._proxies = dict.fromkeys(order)
+            self._healthy = deque(proxy for proxy in order if proxy not in self.failed_proxies)
             logger.debug("Proxy list shuffled")
     
     def add_proxy(self, proxy: str):
         """Add a new proxy to the list"""
-        if proxy not in self.proxy_list:
-            self.proxy_list.append(proxy)
+        if proxy not in self._proxies:
+            self._proxies[proxy] = None
+            self._proxy_dicts[proxy] = self._build_proxy_dict(proxy)
+            self._healthy.append(proxy)
             self.proxy_stats[proxy] = {
                 'total_requests': 0,
                 'successful_requests': 0,
                 'failed_requests': 0,
-                'last_used': None,
+                'failed_health_checks': 0,
                 'is_working': True
             }
             logger.info(f"Added new proxy: {proxy}")
     
     def remove_proxy(self, proxy: str):
         """Remove a proxy from the list"""
-        if proxy in self.proxy_list:
-            self.proxy_list.remove(proxy)
+        if proxy in self._proxies:
+            del self._proxies[proxy]
             if proxy in self.proxy_stats:
                 del self.proxy_stats[proxy]
+            self._proxy_dicts.pop(proxy, None)
+            self._last_used.pop(proxy, None)
             if proxy in self.failed_proxies:
                 self.failed_proxies.remove(proxy)
-            
-            # Adjust current index if needed
-            if self.current_proxy_index >= len(self.proxy_list) and self.proxy_list:
-                self.current_proxy_index = 0
+            self._retry_at.pop(proxy, None)
+            try:
+                self._healthy.remove(proxy)
+            except ValueError:
+                pass
             
             logger.info(f"Removed proxy: {proxy}")
     
     def get_best_proxy(self) -> Optional[str]:
         """Get the proxy with the highest success rate"""
-        if not self.proxy_list:
+        if not self._proxies:
             return None
         
         best_proxy = None
@@ -281,11 +481,8 @@ class ProxyManager:
             if not stats['is_working']:
                 continue
             
-            if stats['total_requests'] == 0:
-                # New proxy, give it a chance
-                success_rate = 100
-            else:
-                success_rate = (stats['successful_requests'] / stats['total_requests']) * 100
+            # New proxies get a chance
+            success_rate = self._success_rate(stats, default=100)
             
             if success_rate > best_success_rate:
                 best_success_rate = success_rate
@@ -313,10 +510,8 @@ class ProxyManager:
     
     def get_random_proxy(self) -> Optional[str]:
         """Get a random working proxy"""
-        working_proxies = [proxy for proxy, stats in self.proxy_stats.items() 
-                          if stats['is_working']]
-        
-        if working_proxies:
-            return random.choice(working_proxies)
+        # The healthy deque already holds exactly the working proxies; no per-call list to build
+        if self._healthy:
+            return self._rng.choice(self._healthy)
         
         return None
\ No newline at end of file
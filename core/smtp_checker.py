@@ -1,113 +1,491 @@
+import asyncio
+import errno
+import logging
+import os
+import selectors
 import smtplib
 import socket
+import threading
 import time
 import ssl
+from collections import OrderedDict
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Optional, List
-from config import SMTP_TIMEOUT, SMTP_PORT, TEST_EMAIL_RECIPIENT, TEST_EMAIL_SUBJECT, TEST_EMAIL_BODY
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, List, Tuple
+from config import (
+    SMTP_TIMEOUT, SMTP_PORT, SMTP_BATCH_CONCURRENCY, SMTP_POOL_MAX_HOSTS, SMTP_POOL_IDLE_TIMEOUT, MAX_WORKERS,
+    SMTP_POOL_MAX_AGE, SMTP_POOL_MAX_RECIPIENTS, SMTP_PROBE_CACHE_SIZE, SMTP_PROBE_CACHE_TTL,
+    TEST_EMAIL_RECIPIENT, TEST_EMAIL_SUBJECT, TEST_EMAIL_BODY
+)
+from utils.cache import TTLCache
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Ports probed by check_smtp_connection
+_SMTP_PROBE_PORTS = (587, 25, 465, 2525)
+
+# Known provider SMTP servers: domain -> (server, port, use_tls)
+_SMTP_CONFIGS: Mapping[str, Tuple[str, int, bool]] = MappingProxyType({
+    # Gmail
+    'gmail.com': ('smtp.gmail.com', 587, True),
+
+    # Yahoo variations
+    'yahoo.com': ('smtp.mail.yahoo.com', 587, True),
+    'yahoo.co.uk': ('smtp.mail.yahoo.com', 587, True),
+    'yahoo.co.jp': ('smtp.mail.yahoo.co.jp', 587, True),
+    'yahoo.ca': ('smtp.mail.yahoo.com', 587, True),
+    'yahoo.de': ('smtp.mail.yahoo.com', 587, True),
+
+    # Microsoft variations
+    'hotmail.com': ('smtp-mail.outlook.com', 587, True),
+    'hotmail.co.uk': ('smtp-mail.outlook.com', 587, True),
+    'outlook.com': ('smtp-mail.outlook.com', 587, True),
+    'live.com': ('smtp-mail.outlook.com', 587, True),
+    'live.co.uk': ('smtp-mail.outlook.com', 587, True),
+    'msn.com': ('smtp-mail.outlook.com', 587, True),
+
+    # AOL
+    'aol.com': ('smtp.aol.com', 587, True),
+    'aol.co.uk': ('smtp.aol.com', 587, True),
+
+    # Verizon
+    'verizon.com': ('smtp.verizon.net', 587, True),
+    'verizon.net': ('smtp.verizon.net', 587, True),
+
+    # AT&T
+    'att.com': ('outbound.att.net', 587, True),
+    'att.net': ('outbound.att.net', 587, True),
+
+    # Japanese providers
+    'docomo.ne.jp': ('mail.docomo.ne.jp', 587, True),
+    'ezweb.ne.jp': ('mail.ezweb.ne.jp', 587, True),
+    'softbank.ne.jp': ('mail.softbank.ne.jp', 587, True),
+    'softbank.jp': ('mail.softbank.jp', 587, True),
+    'nifty.com': ('mail.nifty.com', 587, True),
+    'excite.co.jp': ('mail.excite.co.jp', 587, True),
+
+    # Chinese providers
+    'qq.com': ('smtp.qq.com', 587, True),
+    'sina.com': ('smtp.sina.com', 587, True),
+    '126.com': ('smtp.126.com', 587, True),
+    '163.com': ('smtp.163.com', 587, True),
+
+    # Korean providers
+    'naver.com': ('smtp.naver.com', 587, True),
+    'daum.net': ('smtp.daum.net', 587, True),
+
+    # European providers
+    'web.de': ('smtp.web.de', 587, True),
+    'gmx.de': ('smtp.gmx.de', 587, True),
+    'gmx.com': ('smtp.gmx.com', 587, True),
+    'freenet.de': ('smtp.freenet.de', 587, True),
+    't-online.de': ('smtp.t-online.de', 587, True),
+
+    # Other major providers
+    'mail.com': ('smtp.mail.com', 587, True),
+    'inbox.com': ('smtp.inbox.com', 587, True),
+    'zoho.com': ('smtp.zoho.com', 587, True),
+    'protonmail.com': ('smtp.protonmail.com', 587, True),
+})
+
+
+def _smtp_config(entry: Tuple[str, int, bool]) -> Dict:
+    """Build an SMTP config dict from a (server, port, use_tls) table entry"""
+    return {
+        'server': entry[0],
+        'port': entry[1],
+        'use_tls': entry[2]
+    }
+
 class SMTPChecker:
     def __init__(self):
         self.timeout = SMTP_TIMEOUT
+        # Idle SMTP sessions per (mx_server, port), most recently used host last
+        self._smtp_pool: OrderedDict = OrderedDict()
+        self._smtp_pool_lock = threading.Lock()
+        # Reachability results per MX host and discovered servers per domain
+        self._probe_cache = TTLCache(SMTP_PROBE_CACHE_SIZE, default_ttl=SMTP_PROBE_CACHE_TTL)
+        self._discover_cache = TTLCache(SMTP_PROBE_CACHE_SIZE, default_ttl=SMTP_PROBE_CACHE_TTL)
         logger.info("SMTP checker initialized")
         
-    def check_smtp_connection(self, mx_server: str) -> Dict:
-        """Test SMTP connection to server with multiple port attempts"""
-        logger.debug(f"Testing SMTP connection to: {mx_server}")
+    def _probe_ports_nonblocking(self, mx_server: str, ports: Iterable[int], timeout: float) -> Optional[int]:
+        """Connect to all ports of every MX address at once on non-blocking sockets; return the first port that accepts"""
+        addresses = {}
+        for family, socktype, proto, _, sockaddr in socket.getaddrinfo(mx_server, None, type=socket.SOCK_STREAM):
+            if family in (socket.AF_INET, socket.AF_INET6):
+                addresses.setdefault((family, sockaddr[0]), (family, socktype, proto, sockaddr))
         
-        # Try multiple ports in order of preference
-        ports_to_try = [587, 25, 465, 2525]
-        
-        for port in ports_to_try:
+        selector = selectors.DefaultSelector()
+        try:
+            for family, socktype, proto, sockaddr in addresses.values():
+                for port in ports:
+                    try:
+                        sock = socket.socket(family, socktype, proto)
+                    except OSError as e:
+                        # e.g. IPv6 disabled on this host; the other addresses still get probed
+                        logger.debug("Cannot probe %s on %s: %s", sockaddr[0], mx_server, e)
+                        break
+                    sock.setblocking(False)
+                    err = sock.connect_ex((sockaddr[0], port) + sockaddr[2:])
+                    if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                        logger.debug("Port %s failed on %s (%s): %s", port, mx_server, sockaddr[0], os.strerror(err))
+                        sock.close()
+                        continue
+                    selector.register(sock, selectors.EVENT_WRITE, (port, sockaddr[0]))
+            
+            # A firewalled port or dead address no longer delays the others by a full timeout
+            deadline = time.monotonic() + timeout
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    sock = key.fileobj
+                    port, address = key.data
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if err == 0:
+                        return port
+                    logger.debug("Port %s failed on %s (%s): %s", port, mx_server, address, os.strerror(err))
+                    selector.unregister(sock)
+                    sock.close()
+            return None
+        finally:
+            # First success wins; probes still pending are dropped
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+    
+    def check_smtp_connection(self, mx_server: str) -> Dict:
+        """Test SMTP connection to server, probing all ports concurrently"""
+        # Every address at a provider shares its MX hosts; 0 caches "unreachable on every address"
+        port = self._probe_cache.get(mx_server)
+        if port is None:
+            logger.debug("Testing SMTP connection to: %s", mx_server)
             try:
-                logger.debug(f"Trying port {port} on {mx_server}")
-                
-                # Create socket connection with timeout
-                sock = socket.create_connection((mx_server, port), timeout=self.timeout)
-                sock.close()
-                
-                logger.debug(f"SMTP port {port} accessible on {mx_server}")
-                return {
-                    'smtp_valid': True,
-                    'smtp_response': f'Port {port} accessible',
-                    'server': mx_server,
-                    'port': port
-                }
-            except Exception as e:
-                logger.debug(f"Port {port} failed on {mx_server}: {e}")
-                continue
+                port = self._probe_ports_nonblocking(mx_server, _SMTP_PROBE_PORTS, self.timeout) or 0
+                self._probe_cache.set(mx_server, port)
+            except (OSError, UnicodeError) as e:
+                # Resolution failures may be transient, so they are not cached
+                logger.debug("Could not resolve %s: %s", mx_server, e)
+                port = 0
         
-        logger.debug(f"All SMTP ports failed for {mx_server}")
+        if port:
+            logger.debug("SMTP port %s accessible on %s", port, mx_server)
+            return {
+                'smtp_valid': True,
+                'smtp_response': f'Port {port} accessible',
+                'server': mx_server,
+                'port': port
+            }
+        
+        logger.debug("All SMTP ports failed for %s", mx_server)
         return {
             'smtp_valid': False,
             'smtp_response': 'All SMTP ports unreachable',
             'server': mx_server
         }
     
-    def verify_email_deliverability(self, email: str, mx_server: str) -> Dict:
-        """Test if email can receive messages using SMTP commands"""
-        logger.debug(f"Testing deliverability for: {email} via {mx_server}")
+    def _connect_smtp(self, mx_server: str, port: int) -> smtplib.SMTP:
+        """Open a new SMTP session to mx_server and identify"""
+        logger.debug("Connecting to %s:%s", mx_server, port)
+        server = smtplib.SMTP(timeout=self.timeout)
+        try:
+            server.connect(mx_server, port)
+            # EHLO to learn extensions such as PIPELINING; fall back for servers that only speak HELO
+            code, _ = server.ehlo('validator.test')
+            if not 200 <= code <= 299:
+                server.helo('validator.test')
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _checkout_smtp(self, mx_server: str, port: int, recipients: int = 1) -> Tuple[smtplib.SMTP, bool, float, int]:
+        """Take an idle pooled session for (mx_server, port) with room for `recipients` more, or open a new one.
+        
+        Returns (server, reused, created_at, recipients checked so far).
+        """
+        now = time.monotonic()
+        with self._smtp_pool_lock:
+            idle = self._smtp_pool.get((mx_server, port))
+            while idle:
+                server, last_used, created_at, uses = idle.pop()
+                if now - last_used < SMTP_POOL_IDLE_TIMEOUT and uses + recipients <= SMTP_POOL_MAX_RECIPIENTS:
+                    return server, True, created_at, uses
+                server.close()  # stale or nearly used up; don't bother with QUIT
+        
+        return self._connect_smtp(mx_server, port), False, time.monotonic(), 0
+    
+    def _checkin_smtp(self, mx_server: str, port: int, server: smtplib.SMTP, created_at: float, uses: int):
+        """Return a session to the pool, evicting the least recently used host when full"""
+        now = time.monotonic()
+        if uses >= SMTP_POOL_MAX_RECIPIENTS or now - created_at >= SMTP_POOL_MAX_AGE:
+            # Recycle long-lived sessions before the server starts throttling or dropping them
+            self._quit_smtp(server)
+            return
+        
+        key = (mx_server, port)
+        evicted = []
+        with self._smtp_pool_lock:
+            idle = self._smtp_pool.setdefault(key, [])
+            self._smtp_pool.move_to_end(key)
+            if len(idle) < MAX_WORKERS:
+                idle.append((server, now, created_at, uses))
+                server = None
+            while len(self._smtp_pool) > SMTP_POOL_MAX_HOSTS:
+                evicted.extend(self._smtp_pool.popitem(last=False)[1])
+        
+        if server is not None:
+            self._quit_smtp(server)
+        for old_server, *_ in evicted:
+            self._quit_smtp(old_server)
+    
+    def _quit_smtp(self, server: smtplib.SMTP):
+        """Politely end a session, ignoring errors"""
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
+    def cache_stats(self) -> Dict:
+        """Get hit/miss statistics for the probe and discovery caches"""
+        return {
+            'probe': self._probe_cache.stats(),
+            'discover': self._discover_cache.stats()
+        }
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close_all()
+    
+    def close_all(self):
+        """Quit every pooled SMTP session"""
+        with self._smtp_pool_lock:
+            sessions = [entry[0] for idle in self._smtp_pool.values() for entry in idle]
+            self._smtp_pool.clear()
+        
+        for server in sessions:
+            self._quit_smtp(server)
+    
+    def _start_transaction(self, server: smtplib.SMTP,
+                           email: str) -> Tuple[Tuple[int, bytes], Optional[Tuple[int, bytes]]]:
+        """MAIL FROM, pipelined with the first RCPT TO when the server supports it.
+        
+        Returns (MAIL FROM reply, RCPT TO reply or None if RCPT TO was not sent).
+        """
+        if not server.has_extn('pipelining'):
+            return server.mail('test@validator.com'), None
         
+        # RFC 2920: send both commands before reading either reply, saving a round trip
+        server.putcmd('mail', f"FROM:{smtplib.quoteaddr('test@validator.com')}")
+        server.putcmd('rcpt', f'TO:{smtplib.quoteaddr(email)}')
+        return server.getreply(), server.getreply()
+    
+    def _restart_transaction(self, server: smtplib.SMTP):
+        """RSET and a new MAIL FROM; raises if the server refuses the sender"""
+        server.rset()
+        code, response = server.mail('test@validator.com')
+        logger.debug("MAIL FROM response: %s %s", code, response)
+        if code not in [250, 251]:
+            raise smtplib.SMTPSenderRefused(code, response, 'test@validator.com')
+    
+    @staticmethod
+    def _rcpt_result(code: int, message: str, port: int) -> Dict:
+        """Deliverability result for one RCPT TO reply; 4xx replies are temporary, so the mailbox is unknown"""
+        return {
+            'deliverable': code in [250, 251],
+            'retryable': 400 <= code < 500,
+            'smtp_code': code,
+            'smtp_message': message,
+            'port_used': port
+        }
+    
+    def _rcpt_batch(self, emails: List[str], mx_server: str, port: int) -> Optional[List[Dict]]:
+        """One MAIL FROM then RCPT TO per address on a pooled session; None if the server refused MAIL FROM.
+        
+        If the session breaks part-way, the replies received so far are returned and the caller retries the rest.
+        """
+        server, reused, created_at, uses = self._checkout_smtp(mx_server, port, len(emails))
+        results = []
         try:
-            # Try multiple ports for deliverability check
-            ports_to_try = [25, 587, 465]
+            # Test MAIL FROM
+            logger.debug("Testing MAIL FROM for %s address(es) via %s", len(emails), mx_server)
+            try:
+                (code, response), first_rcpt = self._start_transaction(server, emails[0])
+            except (smtplib.SMTPServerDisconnected, OSError):
+                if not reused:
+                    raise
+                # The pooled session timed out or was reset server-side; retry once on a fresh one
+                server.close()
+                server = self._connect_smtp(mx_server, port)
+                created_at, uses = time.monotonic(), 0
+                (code, response), first_rcpt = self._start_transaction(server, emails[0])
+            logger.debug("MAIL FROM response: %s %s", code, response)
             
-            for port in ports_to_try:
-                try:
-                    with smtplib.SMTP(timeout=self.timeout) as server:
-                        # Connect and identify
-                        logger.debug(f"Connecting to {mx_server}:{port}")
-                        server.connect(mx_server, port)
-                        server.helo('validator.test')
-                        
-                        # Test MAIL FROM
-                        logger.debug(f"Testing MAIL FROM for {email}")
-                        code, response = server.mail('test@validator.com')
-                        logger.debug(f"MAIL FROM response: {code} {response}")
-                        
-                        if code not in [250, 251]:
-                            continue
-                        
-                        # Test RCPT TO
-                        logger.debug(f"Testing RCPT TO for {email}")
-                        code, response = server.rcpt(email)
-                        logger.debug(f"RCPT TO response: {code} {response}")
-                        
-                        deliverable = code in [250, 251]
-                        message = response.decode() if isinstance(response, bytes) else str(response)
-                        
-                        result = {
-                            'deliverable': deliverable,
-                            'smtp_code': code,
-                            'smtp_message': message,
-                            'port_used': port
-                        }
-                        
-                        logger.debug(f"Deliverability test result for {email}: {deliverable}")
-                        return result
-                        
-                except Exception as e:
-                    logger.debug(f"Port {port} failed for deliverability test: {e}")
-                    continue
+            if code not in [250, 251]:
+                self._quit_smtp(server)
+                return None
             
-            # If all ports failed
-            return {
-                'deliverable': False,
-                'smtp_code': 550,
-                'smtp_message': 'All SMTP ports failed for deliverability test'
-            }
+            for i, email in enumerate(emails):
+                # Test RCPT TO
+                logger.debug("Testing RCPT TO for %s", email)
+                if i == 0 and first_rcpt is not None:
+                    code, response = first_rcpt
+                else:
+                    code, response = server.rcpt(email)
+                logger.debug("RCPT TO response: %s %s", code, response)
+                
+                if code == 503:
+                    # Bad sequence: the server dropped the transaction, so this is no mailbox verdict;
+                    # start a fresh one and ask again
+                    self._restart_transaction(server)
+                    code, response = server.rcpt(email)
+                    logger.debug("RCPT TO response: %s %s", code, response)
+                if code in (421, 503):
+                    # Session is closing or still unusable; the rest is left to the caller
+                    raise smtplib.SMTPResponseException(code, response)
                 
+                message = response.decode() if isinstance(response, bytes) else str(response)
+                results.append(self._rcpt_result(code, message, port))
+            
+            # Reset the transaction so the session can be reused for the next batch
+            server.rset()
         except Exception as e:
-            logger.debug(f"SMTP deliverability test failed for {email}: {e}")
-            return {
-                'deliverable': False,
-                'smtp_code': 550,
-                'smtp_message': f'SMTP error: {str(e)}'
-            }
+            server.close()
+            if not results:
+                raise
+            logger.debug("SMTP session to %s failed after %s of %s address(es): %s", mx_server, len(results), len(emails), e)
+            return results
+        
+        self._checkin_smtp(mx_server, port, server, created_at, uses + len(emails))
+        return results
+    
+    def verify_batch(self, emails: List[str], mx_server: str) -> List[Dict]:
+        """Test deliverability of several addresses sharing mx_server over pooled SMTP sessions.
+        
+        Addresses are sent in chunks of at most SMTP_POOL_MAX_RECIPIENTS, one transaction per chunk,
+        so no session carries more recipients than the pool allows.
+        """
+        logger.debug("Testing deliverability for %s address(es) via %s", len(emails), mx_server)
+        results = []
+        for start in range(0, len(emails), SMTP_POOL_MAX_RECIPIENTS):
+            results.extend(self._verify_chunk(emails[start:start + SMTP_POOL_MAX_RECIPIENTS], mx_server))
+        return results
+    
+    def _verify_chunk(self, emails: List[str], mx_server: str) -> List[Dict]:
+        """RCPT TO one chunk of addresses, trying each deliverability port in turn"""
+        results = []
+        
+        # Try multiple ports for deliverability check; replies already received are kept across retries
+        ports_to_try = [25, 587, 465]
+        for port in ports_to_try:
+            while len(results) < len(emails):
+                try:
+                    batch = self._rcpt_batch(emails[len(results):], mx_server, port)
+                except Exception as e:
+                    logger.debug("Port %s failed for deliverability test: %s", port, e)
+                    break
+                if batch is None:
+                    break
+                results.extend(batch)
+            
+            if len(results) == len(emails):
+                if logger.isEnabledFor(logging.DEBUG):
+                    for email, result in zip(emails, results):
+                        logger.debug("Deliverability test result for %s: %s", email, result['deliverable'])
+                return results
+        
+        # If all ports failed
+        return results + [{
+            'deliverable': False,
+            'smtp_code': 550,
+            'smtp_message': 'All SMTP ports failed for deliverability test'
+        } for _ in emails[len(results):]]
+    
+    def verify_email_deliverability(self, email: str, mx_server: str) -> Dict:
+        """Test if email can receive messages using SMTP commands"""
+        return self.verify_batch([email], mx_server)[0]
+    
+    async def _a_smtp_reply(self, reader: asyncio.StreamReader) -> Tuple[int, str]:
+        """Read a (possibly multi-line) SMTP reply"""
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError('Connection closed by server')
+            lines.append(line[4:].strip().decode(errors='replace'))
+            if line[3:4] != b'-':
+                return int(line[:3]), '\n'.join(lines)
+    
+    async def _a_smtp_command(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                              command: str) -> Tuple[int, str]:
+        """Send one SMTP command and read its reply"""
+        writer.write(f'{command}\r\n'.encode())
+        await writer.drain()
+        return await self._a_smtp_reply(reader)
+    
+    async def _a_rcpt_check(self, email: str, mx_server: str, port: int) -> Optional[Dict]:
+        """One HELO/MAIL/RCPT conversation; None if the server refused MAIL FROM"""
+        reader, writer = await asyncio.open_connection(mx_server, port)
+        try:
+            await self._a_smtp_reply(reader)  # greeting
+            await self._a_smtp_command(reader, writer, 'HELO validator.test')
+            
+            code, response = await self._a_smtp_command(reader, writer, 'MAIL FROM:<test@validator.com>')
+            logger.debug("MAIL FROM response: %s %s", code, response)
+            if code not in [250, 251]:
+                return None
+            
+            code, response = await self._a_smtp_command(reader, writer, f'RCPT TO:<{email}>')
+            logger.debug("RCPT TO response: %s %s", code, response)
+            
+            writer.write(b'QUIT\r\n')
+            return self._rcpt_result(code, response, port)
+        finally:
+            writer.close()
+    
+    async def a_verify_email_deliverability(self, email: str, mx_server: str) -> Dict:
+        """Async counterpart of verify_email_deliverability; the SMTP dialogue runs on the event loop"""
+        logger.debug("Testing deliverability for: %s via %s", email, mx_server)
+        
+        for port in [25, 587, 465]:
+            try:
+                result = await asyncio.wait_for(self._a_rcpt_check(email, mx_server, port), timeout=self.timeout)
+                if result:
+                    logger.debug("Deliverability test result for %s: %s", email, result['deliverable'])
+                    return result
+            except (OSError, asyncio.TimeoutError, ValueError, UnicodeError) as e:
+                logger.debug("Port %s failed for deliverability test: %s", port, e)
+        
+        return {
+            'deliverable': False,
+            'smtp_code': 550,
+            'smtp_message': 'All SMTP ports failed for deliverability test'
+        }
+    
+    def verify_emails_deliverability(self, checks: Iterable[Tuple[str, str]],
+                                     concurrency: int = SMTP_BATCH_CONCURRENCY) -> List[Dict]:
+        """Run many (email, mx_server) deliverability checks on one event loop; results follow input order.
+        
+        Must be called from synchronous code (it starts its own event loop).
+        """
+        checks = list(checks)
+        logger.info(f"Testing deliverability for {len(checks)} emails (concurrency: {concurrency})")
+        
+        async def gather() -> List[Dict]:
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def bounded(email: str, mx_server: str) -> Dict:
+                async with semaphore:
+                    return await self.a_verify_email_deliverability(email, mx_server)
+            
+            return await asyncio.gather(*(bounded(email, mx_server) for email, mx_server in checks))
+        
+        return asyncio.run(gather())
     
     def test_smtp_authentication(self, email: str, password: str) -> Dict:
         """Test SMTP authentication with comprehensive provider support"""
@@ -116,82 +494,20 @@ class SMTPChecker:
         try:
             domain = email.split('@')[1].lower()
             
-            # Comprehensive SMTP server configurations
-            smtp_configs = {
-                # Gmail
-                'gmail.com': {'server': 'smtp.gmail.com', 'port': 587, 'use_tls': True},
-                
-                # Yahoo variations
-                'yahoo.com': {'server': 'smtp.mail.yahoo.com', 'port': 587, 'use_tls': True},
-                'yahoo.co.uk': {'server': 'smtp.mail.yahoo.com', 'port': 587, 'use_tls': True},
-                'yahoo.co.jp': {'server': 'smtp.mail.yahoo.co.jp', 'port': 587, 'use_tls': True},
-                'yahoo.ca': {'server': 'smtp.mail.yahoo.com', 'port': 587, 'use_tls': True},
-                'yahoo.de': {'server': 'smtp.mail.yahoo.com', 'port': 587, 'use_tls': True},
-                
-                # Microsoft variations
-                'hotmail.com': {'server': 'smtp-mail.outlook.com', 'port': 587, 'use_tls': True},
-                'hotmail.co.uk': {'server': 'smtp-mail.outlook.com', 'port': 587, 'use_tls': True},
-                'outlook.com': {'server': 'smtp-mail.outlook.com', 'port': 587, 'use_tls': True},
-                'live.com': {'server': 'smtp-mail.outlook.com', 'port': 587, 'use_tls': True},
-                'live.co.uk': {'server': 'smtp-mail.outlook.com', 'port': 587, 'use_tls': True},
-                'msn.com': {'server': 'smtp-mail.outlook.com', 'port': 587, 'use_tls': True},
-                
-                # AOL
-                'aol.com': {'server': 'smtp.aol.com', 'port': 587, 'use_tls': True},
-                'aol.co.uk': {'server': 'smtp.aol.com', 'port': 587, 'use_tls': True},
-                
-                # Verizon
-                'verizon.com': {'server': 'smtp.verizon.net', 'port': 587, 'use_tls': True},
-                'verizon.net': {'server': 'smtp.verizon.net', 'port': 587, 'use_tls': True},
-                
-                # AT&T
-                'att.com': {'server': 'outbound.att.net', 'port': 587, 'use_tls': True},
-                'att.net': {'server': 'outbound.att.net', 'port': 587, 'use_tls': True},
-                
-                # Japanese providers
-                'docomo.ne.jp': {'server': 'mail.docomo.ne.jp', 'port': 587, 'use_tls': True},
-                'ezweb.ne.jp': {'server': 'mail.ezweb.ne.jp', 'port': 587, 'use_tls': True},
-                'softbank.ne.jp': {'server': 'mail.softbank.ne.jp', 'port': 587, 'use_tls': True},
-                'softbank.jp': {'server': 'mail.softbank.jp', 'port': 587, 'use_tls': True},
-                'nifty.com': {'server': 'mail.nifty.com', 'port': 587, 'use_tls': True},
-                'excite.co.jp': {'server': 'mail.excite.co.jp', 'port': 587, 'use_tls': True},
-                
-                # Chinese providers
-                'qq.com': {'server': 'smtp.qq.com', 'port': 587, 'use_tls': True},
-                'sina.com': {'server': 'smtp.sina.com', 'port': 587, 'use_tls': True},
-                '126.com': {'server': 'smtp.126.com', 'port': 587, 'use_tls': True},
-                '163.com': {'server': 'smtp.163.com', 'port': 587, 'use_tls': True},
-                
-                # Korean providers
-                'naver.com': {'server': 'smtp.naver.com', 'port': 587, 'use_tls': True},
-                'daum.net': {'server': 'smtp.daum.net', 'port': 587, 'use_tls': True},
-                
-                # European providers
-                'web.de': {'server': 'smtp.web.de', 'port': 587, 'use_tls': True},
-                'gmx.de': {'server': 'smtp.gmx.de', 'port': 587, 'use_tls': True},
-                'gmx.com': {'server': 'smtp.gmx.com', 'port': 587, 'use_tls': True},
-                'freenet.de': {'server': 'smtp.freenet.de', 'port': 587, 'use_tls': True},
-                't-online.de': {'server': 'smtp.t-online.de', 'port': 587, 'use_tls': True},
-                
-                # Other major providers
-                'mail.com': {'server': 'smtp.mail.com', 'port': 587, 'use_tls': True},
-                'inbox.com': {'server': 'smtp.inbox.com', 'port': 587, 'use_tls': True},
-                'zoho.com': {'server': 'smtp.zoho.com', 'port': 587, 'use_tls': True},
-                'protonmail.com': {'server': 'smtp.protonmail.com', 'port': 587, 'use_tls': True},
-            }
-            
             # Get SMTP config or attempt discovery
-            smtp_config = smtp_configs.get(domain)
+            smtp_config = _SMTP_CONFIGS.get(domain)
+            if smtp_config:
+                smtp_config = _smtp_config(smtp_config)
             
             if not smtp_config:
-                logger.debug(f"No predefined config for {domain}, attempting discovery")
+                logger.debug("No predefined config for %s, attempting discovery", domain)
                 smtp_config = self._discover_smtp_server(domain)
             
             if not smtp_config:
                 logger.warning(f"Could not find SMTP server for domain: {domain}")
                 return {'authenticated': False, 'reason': f'No SMTP server found for domain: {domain}'}
             
-            logger.debug(f"Using SMTP config for {domain}: {smtp_config}")
+            logger.debug("Using SMTP config for %s: %s", domain, smtp_config)
             
             # Test authentication with multiple methods
             auth_methods = [
@@ -203,7 +519,7 @@ class SMTPChecker:
             
             for method in auth_methods:
                 try:
-                    logger.debug(f"Trying authentication method: {method}")
+                    logger.debug("Trying authentication method: %s", method)
                     
                     # Create SMTP connection
                     if method['use_ssl']:
@@ -216,7 +532,7 @@ class SMTPChecker:
                         server.starttls()
                     
                     # Attempt authentication
-                    logger.debug(f"Authenticating {email}")
+                    logger.debug("Authenticating %s", email)
                     server.login(email, password)
                     
                     # Authentication successful
@@ -241,7 +557,7 @@ class SMTPChecker:
                     }
                     
                 except smtplib.SMTPAuthenticationError as e:
-                    logger.debug(f"Authentication failed with method {method}: {e}")
+                    logger.debug("Authentication failed with method %s: %s", method, e)
                     # For Gmail, provide specific guidance
                     if domain == 'gmail.com':
                         return {
@@ -250,7 +566,7 @@ class SMTPChecker:
                         }
                     continue
                 except Exception as e:
-                    logger.debug(f"Connection failed with method {method}: {e}")
+                    logger.debug("Connection failed with method %s: %s", method, e)
                     continue
             
             # All methods failed
@@ -268,6 +584,17 @@ class SMTPChecker:
     
     def _discover_smtp_server(self, domain: str) -> Optional[Dict]:
         """Attempt to discover SMTP server for unknown domains"""
+        # An empty dict caches "nothing found"
+        cached = self._discover_cache.get(domain)
+        if cached is not None:
+            return dict(cached) or None
+        
+        smtp_config = self._discover_smtp_server_uncached(domain)
+        self._discover_cache.set(domain, smtp_config or {})
+        return smtp_config
+    
+    def _discover_smtp_server_uncached(self, domain: str) -> Optional[Dict]:
+        """Probe common SMTP host names and ports for domain"""
         possible_servers = [
             f'smtp.{domain}',
             f'mail.{domain}',
@@ -282,7 +609,7 @@ class SMTPChecker:
         for server in possible_servers:
             for port in ports_to_try:
                 try:
-                    logger.debug(f"Testing SMTP server discovery: {server}:{port}")
+                    logger.debug("Testing SMTP server discovery: %s:%s", server, port)
                     
                     # Test connection
                     sock = socket.create_connection((server, port), timeout=3)
@@ -296,7 +623,7 @@ class SMTPChecker:
                         'use_tls': use_tls
                     }
                     
-                    logger.debug(f"Discovered SMTP server: {smtp_config}")
+                    logger.debug("Discovered SMTP server: %s", smtp_config)
                     return smtp_config
                     
                 except Exception:
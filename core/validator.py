@@ -1,30 +1,46 @@
+import asyncio
+import os
 import re
-from typing import Dict, Tuple, Optional, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Tuple, Optional, List, Set
 
 try:
     from email_validator import validate_email, EmailNotValidError
 except ImportError:
     print("email-validator not installed")
     
-from config import MAX_WORKERS, BATCH_SIZE, TEST_EMAIL_RECIPIENT
-from core.dns_checker import DNSChecker
+from config import (
+    BATCH_SIZE, TEST_EMAIL_RECIPIENT, VALIDATION_CONCURRENCY, DISPOSABLE_DOMAINS_FILE,
+    TRUSTED_MAIL_PROVIDERS, ASSUME_TRUSTED_PROVIDERS_VALID, SMTP_POOL_MAX_RECIPIENTS
+)
+from core.dns_checker import get_dns_checker
 from core.smtp_checker import SMTPChecker
 from core.geo_locator import GeoLocator
 from core.proxy_manager import ProxyManager
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    import aiohttp
+
 logger = setup_logger(__name__)
 
 class EmailValidator:
     def __init__(self, proxy_list: List[str] = None):
-        self.dns_checker = DNSChecker()
+        self.dns_checker = get_dns_checker()
         self.smtp_checker = SMTPChecker()
-        self.geo_locator = GeoLocator()
         self.proxy_manager = ProxyManager(proxy_list)
+        self.geo_locator = GeoLocator(self.dns_checker, self.proxy_manager)
+        # Blocking steps of the async path; kept for the validator's lifetime so batches reuse warm threads
+        self._executor = ThreadPoolExecutor(max_workers=VALIDATION_CONCURRENCY, thread_name_prefix='validator')
+        # Set True to skip the SMTP probe and RCPT check for TRUSTED_MAIL_PROVIDERS (mailbox assumed, not verified)
+        self.assume_trusted_valid = ASSUME_TRUSTED_PROVIDERS_VALID
+        if proxy_list:
+            # Health is tracked passively per request; a periodic re-test catches proxies that recover or die
+            self.proxy_manager.periodic_health_check()
         
-        # Extended disposable domains list
-        self.disposable_domains = {
+        # Extended disposable domains list, plus the optional blocklist file
+        self.disposable_domains = frozenset({
             '10minutemail.com', 'tempmail.org', 'guerrillamail.com',
             'mailinator.com', 'yopmail.com', 'throwaway.email',
             'temp-mail.org', 'emailondeck.com', 'sharklasers.com',
@@ -34,9 +50,21 @@ class EmailValidator:
             'jetable.org', 'mailtemp.info', 'mytemp.email',
             'spambox.us', 'tempmailaddress.com', 'mailnesia.com',
             'mohmal.com', 'burnermail.io', 'dropmail.me'
-        }
+        } | self._load_disposable_domains(DISPOSABLE_DOMAINS_FILE))
         
         logger.info("EmailValidator initialized successfully")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Stop worker threads and release pooled SMTP and proxy-check connections"""
+        self._executor.shutdown(wait=True)
+        self.smtp_checker.close_all()
+        self.proxy_manager.close()
         
     def validate_email_syntax(self, email: str) -> Dict:
         """Validate email syntax according to IETF/RFC standards"""
@@ -66,6 +94,24 @@ class EmailValidator:
             logger.debug(f"Syntax validation failed for {email}: {e}")
             return result
     
+    def _load_disposable_domains(self, path: str) -> Set[str]:
+        """Read one domain per line from path; missing file means no extra domains"""
+        if not os.path.exists(path):
+            return set()
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                domains = {
+                    line.strip().lower() for line in f
+                    if line.strip() and not line.startswith('#')
+                }
+        except OSError as e:
+            logger.error(f"Error reading disposable domains file {path}: {e}")
+            return set()
+        
+        logger.info(f"Loaded {len(domains)} disposable domains from {path}")
+        return domains
+    
     def is_disposable_email(self, domain: str) -> bool:
         """Check if domain is disposable/temporary email"""
         is_disposable = domain.lower() in self.disposable_domains
@@ -114,13 +160,36 @@ class EmailValidator:
         
         return len(common_chars) / len(all_chars) if all_chars else 0.0
     
-    def validate_single_email(self, email_or_domain: str, password: str = "") -> Dict:
+    def validate_single_email(self, email_or_domain: str, password: str = "",
+                              dns_results: Optional[Dict[str, Dict]] = None) -> Dict:
         """
         Validates email or domain.
         For emails: full validation + optional SMTP auth.
         For domains: DNS/MX/country only.
+        dns_results: optional prefetched domain -> validate_domain result (lowercase keys).
+        Runs validate_single_email_async on its own event loop; coroutines should await that directly.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.validate_single_email_async(email_or_domain, password, dns_results))
+        raise RuntimeError("validate_single_email cannot run inside an event loop; await validate_single_email_async instead")
+    
+    async def validate_single_email_async(self, email_or_domain: str, password: str = "",
+                                          dns_results: Optional[Dict[str, Dict]] = None,
+                                          geo_session: Optional['aiohttp.ClientSession'] = None,
+                                          delivery_results: Optional[Dict[str, Dict]] = None,
+                                          syntax_results: Optional[Dict[str, Dict]] = None) -> Dict:
+        """
+        Validates email or domain; the single implementation behind validate_single_email and validate_batch.
+        DNS and geolocation run on the event loop; the port probe, syntax check, pooled
+        RCPT TO check and SMTP auth run on the validator's thread pool.
+        geo_session: optional aiohttp session shared across a batch.
+        delivery_results: optional prefetched normalized email -> verify_email_deliverability result.
+        syntax_results: optional prefetched email -> validate_email_syntax result.
         """
         logger.info(f"Validating: {email_or_domain}")
+        loop = asyncio.get_running_loop()
 
         result = {
             'email': email_or_domain,
@@ -138,7 +207,7 @@ class EmailValidator:
             if '@' not in email_or_domain:
                 # Domain validation
                 domain = email_or_domain
-                dns_result = self.dns_checker.validate_domain(domain)
+                dns_result = await self._a_get_dns_result(domain, dns_results)
                 
                 if not dns_result['is_valid']:
                     result['details'].append("Domain does not exist or DNS lookup failed")
@@ -152,7 +221,7 @@ class EmailValidator:
                 
                 # Country detection for domain
                 proxy = self.proxy_manager.get_working_proxy()
-                geo_result = self.geo_locator.get_email_country(f"info@{domain}", proxy)
+                geo_result = await self.geo_locator.get_email_country_async(f"info@{domain}", proxy, geo_session)
                 result['country'] = geo_result.get('country', 'Unknown')
                 
                 result['status'] = 'VALID'
@@ -162,7 +231,9 @@ class EmailValidator:
                 return result
 
             # Email validation
-            syntax_result = self.validate_email_syntax(email_or_domain)
+            syntax_result = (syntax_results or {}).get(email_or_domain)
+            if syntax_result is None:
+                syntax_result = await loop.run_in_executor(self._executor, self.validate_email_syntax, email_or_domain)
             if not syntax_result['valid']:
                 result['details'].append(f"Invalid syntax: {syntax_result.get('error', 'Unknown')}")
                 logger.info(f"Validation completed for {email_or_domain}: INVALID (syntax)")
@@ -179,7 +250,7 @@ class EmailValidator:
                 return result
 
             # DNS/MX check
-            dns_result = self.dns_checker.validate_domain(domain)
+            dns_result = await self._a_get_dns_result(domain, dns_results)
             if not dns_result['is_valid']:
                 result['details'].append("Domain does not exist or DNS lookup failed")
                 logger.info(f"Validation completed for {email_or_domain}: INVALID (domain/DNS)")
@@ -200,34 +271,50 @@ class EmailValidator:
                 logger.info(f"Validation completed for {email_or_domain}: INVALID (no primary MX)")
                 return result
 
-            # SMTP connection
-            smtp_result = self.smtp_checker.check_smtp_connection(primary_mx)
-            if not smtp_result['smtp_valid']:
-                result['details'].append("SMTP server not reachable or port closed")
-                logger.info(f"Validation completed for {email_or_domain}: INVALID (SMTP conn)")
-                return result
+            # Major providers answer probes uniformly (accept-all or throttled), so skip the round-trips;
+            # nothing was verified, so the SMTP/mailbox points are not awarded
+            mailbox_assumed = self.assume_trusted_valid and domain.lower() in TRUSTED_MAIL_PROVIDERS
+            if mailbox_assumed:
+                result['details'].append("Trusted mail provider, SMTP checks skipped")
+            else:
+                # SMTP connection
+                smtp_result = await loop.run_in_executor(self._executor, self.smtp_checker.check_smtp_connection, primary_mx)
+                if not smtp_result['smtp_valid']:
+                    result['details'].append("SMTP server not reachable or port closed")
+                    logger.info(f"Validation completed for {email_or_domain}: INVALID (SMTP conn)")
+                    return result
 
-            result['validation_score'] += 20
+                result['validation_score'] += 20
 
-            # Mailbox existence check
-            delivery_result = self.smtp_checker.verify_email_deliverability(email_or_domain, primary_mx)
-            if not delivery_result['deliverable']:
-                msg = delivery_result.get('smtp_message', 'Mailbox rejected')
-                result['details'].append(f"Mailbox rejected: {msg}")
-                logger.info(f"Validation completed for {email_or_domain}: INVALID (RCPT TO fail)")
-                return result
+                # Mailbox existence check
+                delivery_result = await self._a_get_delivery_result(syntax_result['normalized'], primary_mx, delivery_results)
+                if delivery_result.get('retryable'):
+                    # 4xx (greylisting, rate limits) says nothing about the mailbox itself
+                    msg = delivery_result.get('smtp_message', 'Temporary failure')
+                    result['details'].append(f"Mailbox check inconclusive, temporary SMTP failure: {msg}")
+                    result['status'] = "SKIPPED"
+                    logger.info(f"Validation completed for {email_or_domain}: SKIPPED (RCPT TO deferred)")
+                    return result
+                
+                if not delivery_result['deliverable']:
+                    msg = delivery_result.get('smtp_message', 'Mailbox rejected')
+                    result['details'].append(f"Mailbox rejected: {msg}")
+                    logger.info(f"Validation completed for {email_or_domain}: INVALID (RCPT TO fail)")
+                    return result
 
-            result['validation_score'] += 20
+                result['validation_score'] += 20
 
             # Country detection
             proxy = self.proxy_manager.get_working_proxy()
-            geo_result = self.geo_locator.get_email_country(email_or_domain, proxy)
+            geo_result = await self.geo_locator.get_email_country_async(email_or_domain, proxy, geo_session)
             result['country'] = geo_result.get('country', 'Unknown')
 
             # SMTP Authentication test (if password provided)
             if password and password.strip():
                 try:
-                    auth_result = self.smtp_checker.test_smtp_authentication(email_or_domain, password)
+                    auth_result = await loop.run_in_executor(
+                        self._executor, self.smtp_checker.test_smtp_authentication, email_or_domain, password
+                    )
                     if auth_result.get('authenticated', False):
                         result['smtp_auth_result'] = 'SUCCESS'
                         result['details'].append("SMTP authentication successful")
@@ -245,7 +332,10 @@ class EmailValidator:
             )
 
             # All checks passed
-            result['details'].append("All checks passed, mailbox exists")
+            if mailbox_assumed:
+                result['details'].append("All checks passed, mailbox assumed to exist (not verified)")
+            else:
+                result['details'].append("All checks passed, mailbox exists")
             result['status'] = "VALID"
             logger.info(f"Validation completed for {email_or_domain}: VALID")
             return result
@@ -256,6 +346,66 @@ class EmailValidator:
             result['status'] = "INVALID"
             return result
     
+    async def _a_get_dns_result(self, domain: str, dns_results: Optional[Dict[str, Dict]]) -> Dict:
+        """Use the prefetched DNS result for domain if available, otherwise resolve it now"""
+        if dns_results:
+            dns_result = dns_results.get(domain.lower())
+            if dns_result is not None:
+                return dns_result
+        return await self.dns_checker.a_validate_domain(domain)
+    
+    async def _a_get_delivery_result(self, email: str, mx_server: str,
+                                     delivery_results: Optional[Dict[str, Dict]]) -> Dict:
+        """Use the prefetched RCPT TO result for email if available, otherwise check it now"""
+        if delivery_results:
+            delivery_result = delivery_results.get(email)
+            if delivery_result is not None:
+                return delivery_result
+        # Same pooled, pipelined session path as the batch prefetch
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.smtp_checker.verify_email_deliverability, email, mx_server)
+    
+    def _prefetch_deliverability(self, syntax_results: Dict[str, Dict],
+                                 dns_results: Dict[str, Dict]) -> Dict[str, Dict]:
+        """RCPT TO every syntactically valid address of the batch grouped by MX host, keyed by normalized address"""
+        groups: Dict[str, Dict[str, None]] = defaultdict(dict)
+        for syntax_result in syntax_results.values():
+            if not syntax_result['valid']:
+                continue
+            domain = syntax_result['domain'].lower()
+            if self.is_disposable_email(domain):
+                continue
+            if self.assume_trusted_valid and domain in TRUSTED_MAIL_PROVIDERS:
+                continue
+            dns_result = dns_results.get(domain)
+            if dns_result and dns_result['is_valid'] and dns_result['mx_info']['primary_mx']:
+                groups[dns_result['mx_info']['primary_mx']][syntax_result['normalized']] = None
+        
+        def check_group(mx_server: str, emails: List[str], found: Dict[str, Dict]):
+            # Unreachable hosts are left to the per-email path, which reports them the usual way
+            if not self.smtp_checker.check_smtp_connection(mx_server)['smtp_valid']:
+                return
+            # Record each chunk as it completes so a later failure keeps the earlier results
+            for start in range(0, len(emails), SMTP_POOL_MAX_RECIPIENTS):
+                chunk = emails[start:start + SMTP_POOL_MAX_RECIPIENTS]
+                found.update(zip(chunk, self.smtp_checker.verify_batch(chunk, mx_server)))
+        
+        found_by_mx = {mx: {} for mx in groups}
+        futures = {
+            mx: self._executor.submit(check_group, mx, list(emails), found_by_mx[mx])
+            for mx, emails in groups.items()
+        }
+        delivery_results = {}
+        for mx, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                # Only the addresses without a result fall back to the per-email check
+                logger.debug("Deliverability prefetch via %s failed after %s of %s address(es): %s",
+                             mx, len(found_by_mx[mx]), len(groups[mx]), e)
+            delivery_results.update(found_by_mx[mx])
+        return delivery_results
+    
     def assess_spam_trap_risk(self, email: str, domain: str, validation_score: int) -> str:
         """Assess spam trap risk based on various factors"""
         risk_score = 0
@@ -303,34 +453,65 @@ class EmailValidator:
             return 'LOW'
     
     def validate_batch(self, email_list: List[Tuple[str, str]]) -> List[Dict]:
-        """Validate batch of emails with multi-threading"""
+        """Validate batch of emails concurrently on one event loop; results follow input order.
+        
+        Must be called from synchronous code (it starts its own event loop).
+        """
         logger.info(f"Starting batch validation for {len(email_list)} emails")
         results = []
         
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_email = {
-                executor.submit(self.validate_single_email, email, password): (email, password)
-                for email, password in email_list
-            }
+        # Syntax is checked once per address; invalid addresses never reach DNS or SMTP
+        addresses = list(dict.fromkeys(email for email, _ in email_list if '@' in email))
+        syntax_results = dict(zip(addresses, self._executor.map(self.validate_email_syntax, addresses)))
+        
+        # Resolve every distinct (non-disposable) domain of the batch up front in one concurrent pass
+        domains = {
+            syntax_result['domain'].lower()
+            for syntax_result in syntax_results.values()
+            if syntax_result['valid']
+        }
+        domains.update(email.lower() for email, _ in email_list if '@' not in email)
+        domains = [domain for domain in domains if domain and not self.is_disposable_email(domain)]
+        dns_results = self.dns_checker.validate_domains(domains) if domains else {}
+        
+        # Addresses sharing an MX host are checked on one SMTP session instead of one conversation each
+        delivery_results = self._prefetch_deliverability(syntax_results, dns_results)
+        
+        async def gather() -> List:
+            semaphore = asyncio.Semaphore(VALIDATION_CONCURRENCY)
+            geo_session = self.geo_locator.open_aio_session()
             
-            for future in as_completed(future_to_email):
-                try:
-                    result = future.result()
-                    results.append(result)
-                    logger.debug(f"Batch item completed: {result['email']} -> {result['status']} (SMTP: {result.get('smtp_auth_result', 'N/A')})")
-                except Exception as e:
-                    email, password = future_to_email[future]
-                    logger.error(f"Batch error for {email}: {e}")
-                    results.append({
-                        'email': email,
-                        'password': password,
-                        'status': 'INVALID',
-                        'country': 'Unknown',
-                        'details': [f"Processing error: {str(e)}"],
-                        'validation_score': 0,
-                        'spam_trap_risk': 'HIGH',
-                        'smtp_auth_result': 'ERROR'
-                    })
+            async def bounded(email: str, password: str) -> Dict:
+                async with semaphore:
+                    return await self.validate_single_email_async(
+                        email, password, dns_results, geo_session, delivery_results, syntax_results
+                    )
+            
+            try:
+                return await asyncio.gather(
+                    *(bounded(email, password) for email, password in email_list),
+                    return_exceptions=True
+                )
+            finally:
+                if geo_session is not None:
+                    await geo_session.close()
+        
+        for (email, password), result in zip(email_list, asyncio.run(gather())):
+            if isinstance(result, Exception):
+                logger.error(f"Batch error for {email}: {result}")
+                results.append({
+                    'email': email,
+                    'password': password,
+                    'status': 'INVALID',
+                    'country': 'Unknown',
+                    'details': [f"Processing error: {str(result)}"],
+                    'validation_score': 0,
+                    'spam_trap_risk': 'HIGH',
+                    'smtp_auth_result': 'ERROR'
+                })
+            else:
+                results.append(result)
+                logger.debug(f"Batch item completed: {result['email']} -> {result['status']} (SMTP: {result.get('smtp_auth_result', 'N/A')})")
         
         logger.info(f"Batch validation completed: {len(results)} results")
         return results
\ No newline at end of file
@@ -154,6 +154,7 @@ def main():
         batch_results = progress_tracker.get_results()
         file_handler.write_results(batch_results)
         progress_tracker.save_progress()
+        validator.geo_locator.save_cache()
         
         # Update progress display
         processed_count += len(batch)
@@ -180,6 +181,7 @@ def main():
     
     # Cleanup
     progress_tracker.cleanup()
+    validator.close()
     
     logger.info(f"Processing completed in {format_time(total_time)}")
 
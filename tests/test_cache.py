@@ -0,0 +1,112 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from utils.cache import SingleFlight, TTLCache
+
+
+class TTLCacheTest(unittest.TestCase):
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(max_size=10, default_ttl=5)
+        with mock.patch('utils.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+            cache.set('b', 2, ttl=60)
+        with mock.patch('utils.cache.time.monotonic', return_value=104.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('utils.cache.time.monotonic', return_value=105.0):
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.stats(), {'size': 1, 'hits': 2, 'misses': 1})
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')  # 'b' is now least recently used
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'answer'
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+        leader.start()
+        started.wait(5)
+        waiters = [threading.Thread(target=lambda: results.append(flight.do('key', slow))) for _ in range(3)]
+        for waiter in waiters:
+            waiter.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + waiters:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['answer'] * 4)
+
+    def test_waiter_runs_fn_itself_after_timeout(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def stuck():
+            started.set()
+            release.wait(5)
+            return 'leader'
+
+        leader = threading.Thread(target=flight.do, args=('key', stuck))
+        leader.start()
+        started.wait(5)
+        try:
+            self.assertEqual(flight.do('key', lambda: 'fallback', timeout=0.05), 'fallback')
+        finally:
+            release.set()
+            leader.join(5)
+
+    def test_leader_error_is_shared_with_waiters(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing():
+            started.set()
+            release.wait(5)
+            raise ValueError('boom')
+
+        errors = []
+
+        def call():
+            try:
+                flight.do('key', failing)
+            except ValueError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+        waiter = threading.Thread(target=call)
+        waiter.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join(5)
+        waiter.join(5)
+        self.assertEqual(len(errors), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+
+import core.proxy_manager as proxy_manager
+from core.proxy_manager import ProxyManager
+
+
+class ProxyBackoffTest(unittest.TestCase):
+    def setUp(self):
+        self.now_ns = 1_000_000_000_000
+        patcher = mock.patch.object(proxy_manager.time, 'monotonic_ns', side_effect=lambda: self.now_ns)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = ProxyManager(['10.0.0.1:8080', '10.0.0.2:8080'])
+        self.addCleanup(self.manager.close)
+
+    def advance(self, seconds):
+        self.now_ns += int(seconds * 1e9)
+
+    def test_failed_proxy_leaves_rotation_until_backoff_expires(self):
+        self.manager.mark_proxy_failed('10.0.0.1:8080')
+        self.assertIn('10.0.0.1:8080', self.manager.failed_proxies)
+        self.assertEqual(len(self.manager._retry_heap), 1)
+        self.assertEqual(self.manager.get_working_proxy(), '10.0.0.2:8080')
+
+        self.advance(proxy_manager.PROXY_RETRY_BACKOFF - 1)
+        self.manager.get_working_proxy()
+        self.assertIn('10.0.0.1:8080', self.manager.failed_proxies)
+
+        self.advance(1)
+        self.manager.get_working_proxy()
+        self.assertNotIn('10.0.0.1:8080', self.manager.failed_proxies)
+        self.assertIn('10.0.0.1:8080', self.manager._healthy)
+        self.assertTrue(self.manager.proxy_stats['10.0.0.1:8080']['is_working'])
+
+    def test_backoff_doubles_per_failure_up_to_the_cap(self):
+        proxy = '10.0.0.1:8080'
+        delays = []
+        for _ in range(12):
+            self.manager.mark_proxy_failed(proxy)
+            delays.append((self.manager._retry_at[proxy] - self.now_ns) / 1e9)
+
+        self.assertEqual(delays[0], proxy_manager.PROXY_RETRY_BACKOFF)
+        self.assertEqual(delays[1], proxy_manager.PROXY_RETRY_BACKOFF * 2)
+        self.assertEqual(delays[-1], proxy_manager.PROXY_RETRY_BACKOFF_MAX)
+
+    def test_superseded_heap_entries_do_not_readmit_early(self):
+        proxy = '10.0.0.1:8080'
+        self.manager.mark_proxy_failed(proxy)
+        self.manager.mark_proxy_failed(proxy)  # second failure pushes a later retry time
+        self.advance(proxy_manager.PROXY_RETRY_BACKOFF)
+        self.manager.get_working_proxy()
+        self.assertIn(proxy, self.manager.failed_proxies)
+
+        self.advance(proxy_manager.PROXY_RETRY_BACKOFF)
+        self.manager.get_working_proxy()
+        self.assertNotIn(proxy, self.manager.failed_proxies)
+
+    def test_health_check_failures_do_not_count_as_request_failures(self):
+        proxy = '10.0.0.1:8080'
+        with mock.patch.object(self.manager, 'test_proxy', side_effect=lambda p: p != proxy):
+            self.manager.test_all_proxies()
+            retry_at = self.manager._retry_at[proxy]
+            self.manager.test_all_proxies()
+
+        stats = self.manager.proxy_stats[proxy]
+        self.assertEqual(stats['failed_requests'], 0)
+        self.assertEqual(stats['failed_health_checks'], 2)
+        self.assertEqual(self.manager._retry_at[proxy], retry_at)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import smtplib
+import time
+import unittest
+from unittest import mock
+
+import core.smtp_checker as smtp_checker
+from core.smtp_checker import SMTPChecker
+
+
+class FakeSMTP:
+    """Minimal smtplib.SMTP stand-in: 'good*' mailboxes exist, everything else is rejected"""
+
+    def __init__(self, fail_after=None, mail_error=None):
+        self.fail_after = fail_after
+        self.mail_error = mail_error
+        self.rcpts = []
+        self.closed = False
+
+    def has_extn(self, name):
+        return False
+
+    def mail(self, sender):
+        if self.mail_error is not None:
+            raise self.mail_error
+        return 250, b'ok'
+
+    def rcpt(self, email):
+        if self.fail_after is not None and len(self.rcpts) >= self.fail_after:
+            raise smtplib.SMTPServerDisconnected('connection lost')
+        self.rcpts.append(email)
+        return (250, b'ok') if email.startswith('good') else (550, b'no such user')
+
+    def rset(self):
+        return 250, b'ok'
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+class RcptBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.checker = SMTPChecker()
+
+    def test_partial_results_are_returned_when_session_breaks(self):
+        server = FakeSMTP(fail_after=2)
+        with mock.patch.object(self.checker, '_connect_smtp', return_value=server):
+            results = self.checker._rcpt_batch(['good1@x', 'bad@x', 'good2@x'], 'mx.example', 25)
+
+        self.assertEqual([r['deliverable'] for r in results], [True, False])
+        self.assertTrue(server.closed)
+        self.assertEqual(self.checker._smtp_pool, {})
+
+    def test_stale_pooled_session_is_replaced_once(self):
+        stale = FakeSMTP(mail_error=ConnectionResetError('reset by peer'))
+        self.checker._checkin_smtp('mx.example', 25, stale, time.monotonic(), 0)
+        fresh = FakeSMTP()
+        with mock.patch.object(self.checker, '_connect_smtp', return_value=fresh) as connect:
+            results = self.checker._rcpt_batch(['good1@x', 'bad@x'], 'mx.example', 25)
+
+        connect.assert_called_once_with('mx.example', 25)
+        self.assertTrue(stale.closed)
+        self.assertEqual(fresh.rcpts, ['good1@x', 'bad@x'])
+        self.assertEqual([r['deliverable'] for r in results], [True, False])
+        # The replacement session goes back to the pool
+        self.assertIs(self.checker._smtp_pool[('mx.example', 25)][0][0], fresh)
+
+    def test_fresh_session_errors_are_not_retried(self):
+        broken = FakeSMTP(mail_error=ConnectionResetError('reset by peer'))
+        with mock.patch.object(self.checker, '_connect_smtp', return_value=broken) as connect:
+            with self.assertRaises(ConnectionResetError):
+                self.checker._rcpt_batch(['good1@x'], 'mx.example', 25)
+        connect.assert_called_once()
+
+
+class VerifyBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.checker = SMTPChecker()
+
+    def test_addresses_are_sent_in_chunks(self):
+        emails = [f'good{i}@x' for i in range(5)]
+        batches = []
+
+        def rcpt_batch(chunk, mx_server, port):
+            batches.append(list(chunk))
+            return [{'deliverable': True, 'smtp_code': 250, 'email': email} for email in chunk]
+
+        with mock.patch.object(smtp_checker, 'SMTP_POOL_MAX_RECIPIENTS', 2), \
+                mock.patch.object(self.checker, '_rcpt_batch', side_effect=rcpt_batch):
+            results = self.checker.verify_batch(emails, 'mx.example')
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([r['email'] for r in results], emails)
+
+    def test_remaining_addresses_are_retried_after_a_broken_session(self):
+        sessions = [FakeSMTP(fail_after=2), FakeSMTP()]
+        with mock.patch.object(self.checker, '_connect_smtp', side_effect=sessions):
+            results = self.checker.verify_batch(['good1@x', 'bad@x', 'good2@x'], 'mx.example')
+
+        self.assertEqual([r['deliverable'] for r in results], [True, False, True])
+        self.assertEqual(sessions[1].rcpts, ['good2@x'])
+
+    def test_temporary_failures_are_retryable(self):
+        server = FakeSMTP()
+        server.rcpt = lambda email: (450, b'greylisted')
+        with mock.patch.object(self.checker, '_connect_smtp', return_value=server):
+            result = self.checker.verify_email_deliverability('someone@x', 'mx.example')
+
+        self.assertFalse(result['deliverable'])
+        self.assertTrue(result['retryable'])
+
+
+if __name__ == '__main__':
+    unittest.main()
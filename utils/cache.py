@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-entry TTL"""
+
+    def __init__(self, max_size: int = 10000, default_ttl: float = 300):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value for key, or default if missing/expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value for key, evicting the least recently used entry when full"""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key from cache and return its value"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry else default
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> Iterator[Tuple[Hashable, Any, float]]:
+        """Yield (key, value, expires_at) for all unexpired entries"""
+        now = time.monotonic()
+        with self._lock:
+            snapshot = list(self._data.items())
+        for key, (value, expires_at) in snapshot:
+            if expires_at > now:
+                yield key, value, expires_at
+
+    def stats(self) -> dict:
+        """Get cache hit/miss statistics"""
+        return {'size': len(self), 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _Call:
+    """In-flight call shared between the leader and its waiters"""
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Run fn once per key; concurrent callers wait for and share its result.
+        
+        If the leader has not finished within timeout, the waiter runs fn itself.
+        """
+        with self._lock:
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._inflight[key] = call
+
+        if not is_leader:
+            if not call.event.wait(timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()